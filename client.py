@@ -1,93 +1,322 @@
 import asyncio
+import base64
+import functools
 import json
 import sys
 import urllib.parse
-from typing import Any, Dict, Optional
-from mcp.types import AnyUrl, ReadResourceResult
+from typing import Any, List, Optional, Tuple, Union
+from mcp.types import AnyUrl, BlobResourceContents, ReadResourceResult
 from mcp.client.session import ClientSession
+from mcp.shared.exceptions import McpError
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    orjson = None
 
-async def fetch_and_process_resource(session: ClientSession, resource_uri: str) -> None:
+# Command used to spawn the MCP server over stdio
+SERVER_PARAMS = StdioServerParameters(command="uv", args=["run", "mcp-zoho"])
+
+# Output formats for list payloads such as inventory://all
+OUTPUT_LINES = "lines"      # one compact JSON document per entry
+OUTPUT_PRETTY = "pretty"    # a single indented JSON document
+OUTPUT_SUMMARY = "summary"  # only the number of entries
+
+# Resource URIs by CLI resource type; the named types take the item name or SKU as a suffix
+_URI_PREFIXES = {
+    "stock": "inventory://stock/",
+    "sku": "inventory://sku/",
+    "warehouses": "inventory://warehouses",
+    "all": "inventory://all",
+}
+_NAMED_RESOURCE_TYPES = frozenset(("stock", "sku"))
+
+# Failures reported per resource: server-side errors, a broken stdio pipe, timeouts and invalid URIs
+_RESOURCE_ERRORS = (McpError, OSError, asyncio.TimeoutError, ValueError)
+
+# Percent-encoder for one URI path segment; "/" is escaped too so names can't split the path
+_quote_segment = functools.partial(urllib.parse.quote_from_bytes, safe=b"")
+
+
+def _encode_segment(value: str) -> str:
+    """URL encode an item name or SKU for use as a single URI path segment"""
+    # Plain alphanumeric values need no escaping
+    if value.isascii() and value.isalnum():
+        return value
+    return _quote_segment(value.encode())
+
+
+@functools.lru_cache(maxsize=1024)
+def _resource_url(resource_uri: str) -> AnyUrl:
+    """Validate a resource URI once; repeated reads of the same URI reuse the AnyUrl"""
+    return AnyUrl(resource_uri)
+
+
+def _loads(text: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        # orjson accepts str directly, so no intermediate encode is needed
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _write_lines(rows: List[Any]) -> None:
+    """Write each entry of a list payload as one compact JSON line (newline-delimited JSON)"""
+    # Rows are encoded and written one at a time, so no document-sized string is built
+    sys.stdout.flush()
+    if orjson is not None:
+        write = sys.stdout.buffer.write
+        for row in rows:
+            write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+    else:
+        write = sys.stdout.write
+        for row in rows:
+            write(json.dumps(row))
+            write("\n")
+    sys.stdout.flush()
+
+
+def _write_pretty(data: Any) -> None:
+    """Write data to stdout as indented JSON without building an intermediate str"""
+    if orjson is not None:
+        # orjson produces UTF-8 bytes; hand them straight to the binary buffer,
+        # flushing first so earlier print() output stays in order
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def process_resource_result(response_obj: ReadResourceResult, output: str = OUTPUT_LINES) -> None:
+    """
+    Parse and print the content of a read_resource response
+    
+    Args:
+        response_obj: The result returned by the session's read_resource
+        output: How list payloads are printed (OUTPUT_LINES, OUTPUT_PRETTY or OUTPUT_SUMMARY)
+    """
+    # Extract the content from the response; ReadResourceResult always has contents
+    contents = response_obj.contents
+    if not contents:
+        print("No content in response")
+        return
+    
+    content = contents[0]
+    if isinstance(content, BlobResourceContents):
+        # Binary payloads are standard base64; they are parsed from the decoded bytes, skipping a str decode
+        response = base64.b64decode(content.blob)
+    else:
+        # Text payloads carry the JSON in the text field
+        response = content.text
+    
+    # Parse the response as JSON
+    try:
+        data = _loads(response)
+        # Only error payloads are objects worth probing; list payloads such as
+        # inventory://all would otherwise be scanned item by item for "error"
+        error = data.get("error") if isinstance(data, dict) else None
+        if error is not None:
+            print(f"Error: {error}")
+            suggestion = data.get("suggestion")
+            if suggestion is not None:
+                print(f"Suggestion: {suggestion}")
+        elif isinstance(data, list) and output == OUTPUT_SUMMARY:
+            print(f"Found {len(data)} items")
+        elif isinstance(data, list) and output == OUTPUT_LINES:
+            _write_lines(data)
+        elif isinstance(data, dict) and isinstance(data.get("items"), list) and output == OUTPUT_LINES:
+            _write_lines(data["items"])
+        else:
+            _write_pretty(data)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    except json.JSONDecodeError as e:
+        print(f"Failed to parse response as JSON: {e}")
+        print(f"Raw response: {response}")
+
+
+async def fetch_and_process_resource(session: ClientSession, resource_uri: str, output: str = OUTPUT_LINES) -> None:
     """
     Fetch a resource from the server and process the response
     
     Args:
         session: The client session to use
         resource_uri: The URI of the resource to fetch
+        output: How list payloads are printed (OUTPUT_LINES, OUTPUT_PRETTY or OUTPUT_SUMMARY)
+    """
+    _print_resource(await _read_resource(session, resource_uri), output)
+
+
+async def _read_resource(session: ClientSession, resource_uri: str) -> Any:
+    """
+    Read a resource, returning rather than raising the failures reported per resource
+    
+    Args:
+        session: The client session to use
+        resource_uri: The URI of the resource to fetch
+        
+    Returns:
+        The ReadResourceResult, or the exception that made the read fail
     """
     try:
-        response_obj = await session.read_resource(AnyUrl(resource_uri))
-        # Extract the text content from the response
-        if hasattr(response_obj, 'contents') and response_obj.contents:
-            # The content is in the first item's text field
-            response = response_obj.contents[0].text
-        else:
-            print("No content in response")
+        return await session.read_resource(_resource_url(resource_uri))
+    except _RESOURCE_ERRORS as e:
+        return e
+
+
+def _print_resource(result: Any, output: str) -> None:
+    """
+    Print a resource read by _read_resource, or the error that reading or processing it raised
+    
+    Args:
+        result: The ReadResourceResult or exception from _read_resource
+        output: How list payloads are printed (OUTPUT_LINES, OUTPUT_PRETTY or OUTPUT_SUMMARY)
+    """
+    if not isinstance(result, _RESOURCE_ERRORS):
+        try:
+            process_resource_result(result, output)
             return
+        except _RESOURCE_ERRORS as e:
+            result = e
+    print(f"Exception: {str(result)}")
+
+
+def build_resource_uri(resource_type: str, resource_name: str = "") -> Optional[str]:
+    """
+    Build the resource URI for a CLI resource type
+    
+    Args:
+        resource_type: One of "stock", "sku", "warehouses" or "all"
+        resource_name: Item name or SKU for the "stock" and "sku" types
         
-        # Parse the response as JSON
-        try:
-            data = json.loads(response)
-            if "error" in data:
-                print(f"Error: {data['error']}")
-                if "suggestion" in data:
-                    print(f"Suggestion: {data['suggestion']}")
-            else:
-                print(json.dumps(data, indent=2))
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse response as JSON: {e}")
-            print(f"Raw response: {response}")
-    except Exception as e:
-        print(f"Exception: {str(e)}")
-
-
-async def main():
+    Returns:
+        The resource URI, or None if the resource type is unknown
+    """
+    prefix = _URI_PREFIXES.get(resource_type)
+    if prefix is None:
+        return None
+    if resource_type in _NAMED_RESOURCE_TYPES:
+        # URL encode the item name or SKU to handle spaces and special chars
+        return prefix + _encode_segment(resource_name)
+    return prefix
+
+
+async def run_commands(session: ClientSession, commands: List[Tuple[str, str]], output: str = OUTPUT_LINES) -> None:
+    """
+    Read each requested resource over an already-initialized session
+    
+    Args:
+        session: The client session to use
+        commands: (resource_type, resource_name) pairs to fetch
+        output: How list payloads are printed (OUTPUT_LINES, OUTPUT_PRETTY or OUTPUT_SUMMARY)
+    """
+    resource_uris = []
+    for resource_type, resource_name in commands:
+        resource_uri = build_resource_uri(resource_type, resource_name)
+        if resource_uri is None:
+            print(f"Unknown resource type: {resource_type}")
+            continue
+        resource_uris.append(resource_uri)
+    
+    if len(resource_uris) == 1:
+        await fetch_and_process_resource(session, resource_uris[0], output)
+        return
+    
+    # Issue the reads concurrently; JSON-RPC request ids let the session
+    # multiplex them, so the server-side Zoho calls overlap
+    results = await asyncio.gather(*(_read_resource(session, uri) for uri in resource_uris))
+    
+    # Print in the order the resources were requested
+    for result in results:
+        _print_resource(result, output)
+
+
+async def repl(session: ClientSession, output: str = OUTPUT_LINES) -> None:
+    """
+    Read "<resource_type> [resource_name]" commands from stdin until EOF or "quit"
+    
+    Every command is dispatched against the same session, so the server
+    process is spawned and initialized only once.
+    
+    Args:
+        session: The client session to use
+        output: How list payloads are printed (OUTPUT_LINES, OUTPUT_PRETTY or OUTPUT_SUMMARY)
+    """
+    loop = asyncio.get_running_loop()
+    interactive = sys.stdin.isatty()
+    while True:
+        if interactive:
+            print("> ", end="", flush=True)
+        # Read stdin off the event loop so the session keeps being serviced
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        if line in ("quit", "exit"):
+            break
+        resource_type, _, resource_name = line.partition(" ")
+        await run_commands(session, [(resource_type, resource_name.strip())], output)
+
+
+async def main(
+    commands: Optional[List[Tuple[str, str]]] = None,
+    interactive: bool = False,
+    output: Optional[str] = None
+):
+    """
+    Run the test client
+    
+    Args:
+        commands: (resource_type, resource_name) pairs to fetch; parsed from sys.argv if None
+        interactive: Read commands from stdin instead (also enabled by --repl)
+        output: How list payloads are printed; parsed from --pretty / --summary if None
+    """
     # Check if we have command-line arguments
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-        if command == "read-resource" and len(sys.argv) > 2:
-            resource_type = sys.argv[2]
-            resource_name = sys.argv[3] if len(sys.argv) > 3 else ""
-            
-            # Connect to the server and read the specified resource
-            async with stdio_client(
-                StdioServerParameters(command="uv", args=["run", "mcp-zoho"])
-            ) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    if resource_type == "stock":
-                        # URL encode the item name to handle spaces and special chars
-                        encoded_name = urllib.parse.quote(resource_name)
-                        await fetch_and_process_resource(session, f"inventory://stock/{encoded_name}")
-                    elif resource_type == "sku":
-                        # URL encode the SKU to handle spaces and special chars
-                        encoded_sku = urllib.parse.quote(resource_name)
-                        await fetch_and_process_resource(session, f"inventory://sku/{encoded_sku}")
-                    elif resource_type == "warehouses":
-                        # Get all warehouses
-                        await fetch_and_process_resource(session, "inventory://warehouses")
-                    elif resource_type == "all":
-                        # Get all items
-                        await fetch_and_process_resource(session, "inventory://all")
-                    else:
-                        print(f"Unknown resource type: {resource_type}")
-            return
+    if commands is None:
+        commands = []
+        args = sys.argv[1:]
+        for flag, flag_output in (("--pretty", OUTPUT_PRETTY), ("--summary", OUTPUT_SUMMARY)):
+            if flag in args:
+                output = output or flag_output
+                args.remove(flag)
+        if args:
+            command = args[0]
+            if command == "--repl":
+                interactive = True
+            elif command == "read-resource" and len(args) > 1:
+                resource_type = args[1]
+                # Several names may be given; they are fetched concurrently
+                resource_names = args[2:] or [""]
+                commands.extend((resource_type, name) for name in resource_names)
+    
+    output = output or OUTPUT_LINES
     
-    # Default behavior if no command-line arguments - just list available resources
-    async with stdio_client(
-        StdioServerParameters(command="uv", args=["run", "mcp-zoho"])
-    ) as (read, write):
+    # Spawn the server and run the MCP handshake once for all commands
+    async with stdio_client(SERVER_PARAMS) as (read, write):
         async with ClientSession(read, write) as session:
             await session.initialize()
+            
+            if interactive:
+                await repl(session, output)
+                return
+            
+            if commands:
+                await run_commands(session, commands, output)
+                return
 
-            # List available resources
+            # Default behavior if no commands - just list available resources
             resources = await session.list_resources()
-            print("Available resources:")
-            for resource in resources.resources:
-                print(f"  - {resource.name}: {resource.description}")
-                print(f"    URI: {resource.uri}")
+            # Build the listing once and write it in a single call
+            lines = ["Available resources:"]
+            lines.extend(
+                f"  - {resource.name}: {resource.description}\n    URI: {resource.uri}"
+                for resource in resources.resources
+            )
+            sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
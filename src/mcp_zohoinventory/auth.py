@@ -1,19 +1,43 @@
 import os
-import json
+import asyncio
 import time
 import logging
 import httpx
-from typing import Optional, Dict
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, Tuple
 from pathlib import Path
 
+from . import json_utils
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # Only available on Windows
+    msvcrt = None
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Define token file path
+# Define token file path, and the sidecar file used to serialize refreshes across processes
 TOKEN_FILE = Path.home() / ".mcp_zohoinventory" / "token.json"
+TOKEN_LOCK_FILE = TOKEN_FILE.with_suffix(".lock")
+
+# Fail fast when a host is unreachable, but give slow responses the full read timeout
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Last (access_token, expires_at) read from or written to TOKEN_FILE by this process
+_token_cache: Optional[Tuple[str, float]] = None
 
 def save_token(token: str, expires_in: int = 3600) -> None:
     """Save the auth token and its expiry time to a file"""
+    global _token_cache
+    
     # Create directory if it doesn't exist
     TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
     
@@ -22,24 +46,73 @@ def save_token(token: str, expires_in: int = 3600) -> None:
         "access_token": token,
         "expires_at": time.time() + expires_in
     }
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(token_data, f)
+    # Write to a uniquely named temp file and rename it over the cache so readers never see a partial file
+    fd, tmp_file = tempfile.mkstemp(dir=TOKEN_FILE.parent, prefix=TOKEN_FILE.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_utils.dumps_bytes(token_data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, TOKEN_FILE)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    _token_cache = (token, token_data["expires_at"])
 
-def load_token() -> Optional[str]:
-    """Load the auth token from file if it exists and is not expired"""
+@contextmanager
+def token_file_lock() -> Iterator[None]:
+    """Hold an exclusive inter-process lock on the token cache (flock on POSIX, msvcrt.locking on Windows)"""
+    TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(TOKEN_LOCK_FILE, "a+b") as lock_file:
+        fd = lock_file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            # msvcrt locks a byte range from the current position; LK_LOCK retries for about 10s
+            lock_file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+def load_token(use_cache: bool = True) -> Optional[Tuple[str, float]]:
+    """
+    Load the auth token and its expiry time from file if it exists and is not expired
+    
+    Args:
+        use_cache: Return the token this process last read or wrote while it is
+            still valid, without touching the file
+    
+    Returns:
+        (access_token, expires_at) tuple, or None if there is no usable token
+    """
+    global _token_cache
+    if use_cache and _token_cache is not None and time.time() < _token_cache[1]:
+        return _token_cache
+    
     if not TOKEN_FILE.exists():
         return None
         
     try:
-        with open(TOKEN_FILE, "r") as f:
-            token_data = json.load(f)
+        token_data = json_utils.loads(TOKEN_FILE.read_bytes())
+        if not isinstance(token_data, dict):
+            return None
+        token = token_data.get("access_token")
+        expires_at = token_data.get("expires_at", 0)
             
         # Check if token is expired
-        if time.time() >= token_data.get("expires_at", 0):
+        if not token or time.time() >= expires_at:
             return None
             
-        return token_data.get("access_token")
-    except Exception:
+        _token_cache = (token, expires_at)
+        return _token_cache
+    except (OSError, ValueError):
+        # Unreadable or corrupt cache; a fresh token will be requested
         return None
 
 class ZohoAuth:
@@ -72,68 +145,172 @@ class ZohoAuth:
         
         # Get API domain from environment or use default
         self.api_domain = os.environ.get("ZOHO_API_DOMAIN", "https://www.zohoapis.eu")
-        logger.info(f"Using API domain from .env: {self.api_domain}")
+        logger.info("Using API domain from .env: %s", self.api_domain)
         
         self.auth_url = "https://accounts.zoho.eu/oauth/v2/token"
         self.token_expiry = 0  # Initialize with expired token
         
-        # Try to load existing token or get a new one
-        self.auth_token = load_token()
-        if not self.auth_token:
-            self.refresh_access_token()
+        # Headers are rebuilt lazily whenever the token they were built for changes
+        self._headers: Dict[str, str] = {}
+        self._headers_token: Optional[str] = None
+        
+        # Long-lived HTTP client for the accounts server, reused across refreshes
+        self._http = httpx.Client(timeout=HTTP_TIMEOUT)
+        
+        # Serializes refreshes between threads sharing this instance; threads that
+        # had to wait for an in-flight refresh return its outcome instead of repeating it
+        self._refresh_lock = threading.Lock()
+        self._last_refresh_ok = False
+        
+        # Serializes async refreshes between coroutines; created per event loop like the AsyncClient
+        self._async_refresh_lock: Optional[asyncio.Lock] = None
+        self._async_refresh_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Try to load existing token (and its expiry) or get a new one
+        loaded = load_token()
+        if loaded:
+            self.auth_token, self.token_expiry = loaded
         else:
-            # If token loaded from file, set the expiry time
-            try:
-                with open(TOKEN_FILE, "r") as f:
-                    token_data = json.load(f)
-                    self.token_expiry = token_data.get("expires_at", 0)
-            except Exception:
-                self.refresh_access_token()
+            self.auth_token = None
+            self.refresh_access_token()
     
     def get_headers(self) -> Dict[str, str]:
-        """Get the authorization headers with the current auth token"""
+        """
+        Get the authorization headers with the current auth token
+        
+        The dict is cached and only rebuilt when the token changes, so callers
+        must copy it before adding their own headers.
+        """
+        if self._headers_token != self.auth_token:
+            self._headers = {
+                "Authorization": f"Zoho-oauthtoken {self.auth_token}",
+                "Content-Type": "application/json"
+            }
+            self._headers_token = self.auth_token
+        return self._headers
+    
+    def _get_refresh_params(self) -> Dict[str, str]:
+        """Get the query parameters for a refresh token grant"""
         return {
-            "Authorization": f"Zoho-oauthtoken {self.auth_token}",
-            "Content-Type": "application/json"
+            "refresh_token": self.refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "refresh_token"
         }
     
+    def _apply_token_response(self, data: Dict[str, Any]) -> bool:
+        """
+        Store the access token from a token endpoint response
+        
+        Args:
+            data: Parsed JSON body of the token response
+            
+        Returns:
+            True if the response carried an access token, False otherwise
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            # Everything but the token itself, which must not end up in logs
+            logger.debug("Token refresh response: %s", {k: v for k, v in data.items() if k != "access_token"})
+        self.auth_token = data.get("access_token")
+        
+        if self.auth_token:
+            # Save the new token to file
+            expires_in = data.get("expires_in", 3600)
+            save_token(self.auth_token, expires_in)
+            
+            # Update token expiry time
+            self.token_expiry = time.time() + expires_in
+            
+            logger.info("New auth token obtained")
+            return True
+        return False
+    
+    def _adopt_saved_token(self, stale_token: Optional[str]) -> bool:
+        """
+        Pick up a token another thread or process saved since stale_token was in use
+        
+        Args:
+            stale_token: The token this instance held when it decided to refresh
+            
+        Returns:
+            True if a newer, still valid token was loaded from the cache
+        """
+        # Bypass the in-process cache: the point is to see what other processes saved
+        loaded = load_token(use_cache=False)
+        if not loaded:
+            return False
+        token, expires_at = loaded
+        if token == stale_token or time.time() > (expires_at - 300):
+            return False
+        self.auth_token, self.token_expiry = token, expires_at
+        logger.info("Using auth token refreshed by another worker")
+        return True
+    
     def refresh_access_token(self) -> bool:
         """
         Refresh the access token using the refresh token
         
+        Only one refresh runs at a time: threads that arrive while one is in
+        flight wait for it and share its outcome, and across processes the
+        token the first refresher saved is reused instead of refreshing again.
+        
         Returns:
             True if token was refreshed successfully, False otherwise
         """
-        try:
-            params = {
-                "refresh_token": self.refresh_token,
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "grant_type": "refresh_token"
-            }
-            
-            with httpx.Client() as client:
-                response = client.post(self.auth_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                logger.info(f"Token refresh response: {data}")
-                self.auth_token = data.get("access_token")
-                
-                if self.auth_token:
-                    # Save the new token to file
-                    expires_in = data.get("expires_in", 3600)
-                    save_token(self.auth_token, expires_in)
-                    
-                    # Update token expiry time
-                    self.token_expiry = time.time() + expires_in
-                    
-                    logger.info("New auth token obtained")
-                    return True
+        if not self._refresh_lock.acquire(blocking=False):
+            # A refresh is already in flight on another thread; wait for it to finish
+            if not self._refresh_lock.acquire(timeout=10):
+                logger.error("Timed out waiting for an in-flight token refresh")
                 return False
-        except Exception as e:
-            logger.error(f"Error refreshing token: {str(e)}")
-            return False
+            self._refresh_lock.release()
+            return self._last_refresh_ok
+        
+        stale_token = self.auth_token
+        try:
+            with token_file_lock():
+                if self._adopt_saved_token(stale_token):
+                    self._last_refresh_ok = True
+                else:
+                    response = self._http.post(self.auth_url, params=self._get_refresh_params())
+                    response.raise_for_status()
+                    self._last_refresh_ok = self._apply_token_response(json_utils.loads(response.content))
+        except (httpx.HTTPError, OSError, ValueError) as e:
+            logger.error("Error refreshing token: %s", e)
+            self._last_refresh_ok = False
+        finally:
+            self._refresh_lock.release()
+        return self._last_refresh_ok
+    
+    async def refresh_access_token_async(self) -> bool:
+        """
+        Refresh the access token using the refresh token without blocking the event loop
+        
+        Coroutines that arrive while a refresh is in flight wait for it and
+        reuse the token it obtained instead of refreshing again. The refresh
+        itself runs refresh_access_token on a worker thread, so it is
+        serialized with sync refreshes and other processes by the same locks.
+        
+        Returns:
+            True if token was refreshed successfully, False otherwise
+        """
+        stale_token = self.auth_token
+        async with self._get_async_refresh_lock():
+            # Another coroutine refreshed while this one was waiting for the lock
+            if self.auth_token != stale_token and time.time() < (self.token_expiry - 300):
+                return True
+            return await asyncio.to_thread(self.refresh_access_token)
+    
+    def _get_async_refresh_lock(self) -> asyncio.Lock:
+        """Get the refresh lock for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._async_refresh_lock is None or self._async_refresh_lock_loop is not loop:
+            self._async_refresh_lock = asyncio.Lock()
+            self._async_refresh_lock_loop = loop
+        return self._async_refresh_lock
+    
+    def close(self) -> None:
+        """Close the pooled HTTP connections to the accounts server"""
+        self._http.close()
     
     def ensure_valid_token(self) -> bool:
         """
@@ -145,4 +322,15 @@ class ZohoAuth:
         # If token is about to expire (within 5 minutes), refresh it
         if time.time() > (self.token_expiry - 300):
             return self.refresh_access_token()
+        return True
+    
+    async def ensure_valid_token_async(self) -> bool:
+        """
+        Ensure the access token is valid, refresh without blocking the event loop if needed
+        
+        Returns:
+            True if token is valid, False otherwise
+        """
+        if time.time() > (self.token_expiry - 300):
+            return await self.refresh_access_token_async()
         return True 
\ No newline at end of file
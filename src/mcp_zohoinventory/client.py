@@ -1,19 +1,77 @@
 import os
+import time
+import asyncio
 import logging
+import threading
 import httpx
-from typing import Dict, Optional, Any
-from .auth import ZohoAuth
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any, Tuple
+from . import json_utils
+from .auth import ZohoAuth, HTTP_TIMEOUT
+from .cache import TTLCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Retry policy: connection failures are retried by the transport; throttling and
+# transient server errors are retried with exponential backoff for idempotent methods,
+# and throttling (429, which the server rejects before processing) for any method
+CONNECT_RETRIES = 3
+STATUS_RETRIES = 3
+RETRY_BACKOFF = 0.2
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Longest Retry-After, in seconds, that is waited out before retrying a throttled request
+MAX_RETRY_AFTER = 60
+
+# Requests in flight at once per client (shared by clients created with share_with),
+# however many callers fan out concurrently; counted separately for the sync and async pools
+MAX_CONCURRENT_REQUESTS = 10
+
+# Seconds that an ETag and its body are kept for conditional GETs
+ETAG_CACHE_TTL = 3600
+
+# Sent when a full body is needed, so no cache along the way answers with a 304
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+def http2_enabled() -> bool:
+    """
+    Check whether HTTP/2 was requested through ZOHO_HTTP2 and can be used
+    
+    Returns:
+        True if ZOHO_HTTP2 is set and the h2 package (httpx[http2]) is installed
+    """
+    if os.environ.get("ZOHO_HTTP2", "").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("ZOHO_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+def _should_retry(status_code: int, idempotent: bool) -> bool:
+    """
+    Check whether a response status is worth retrying the request for
+    
+    Args:
+        status_code: HTTP status of the response
+        idempotent: Whether the request method is safe to send twice
+        
+    Returns:
+        True for throttling, and for transient server errors of idempotent requests
+    """
+    return status_code == 429 or (idempotent and status_code in RETRY_STATUS_CODES)
+
 class ZohoClient:
     """Base client for interacting with Zoho Inventory API"""
     
     def __init__(self, 
                  refresh_token: Optional[str] = None,
                  client_id: Optional[str] = None,
-                 client_secret: Optional[str] = None):
+                 client_secret: Optional[str] = None,
+                 share_with: Optional["ZohoClient"] = None):
         """
         Initialize the Zoho client
         
@@ -21,36 +79,267 @@ class ZohoClient:
             refresh_token: Refresh token for getting new access tokens, if None will try to get from environment
             client_id: Client ID for OAuth, if None will try to get from environment
             client_secret: Client Secret for OAuth, if None will try to get from environment
+            share_with: Existing client whose authentication and connection pools are reused;
+                the credential arguments are ignored when it is given
         """
-        # Initialize authentication
-        self.auth = ZohoAuth(refresh_token, client_id, client_secret)
+        # Initialize authentication, or reuse the token of the client that owns the pools
+        if share_with is not None:
+            self._owner = share_with._owner
+            self.auth = self._owner.auth
+        else:
+            self._owner = self
+            self.auth = ZohoAuth(refresh_token, client_id, client_secret)
         
         # Get organization ID from environment
         self.organization_id = os.environ.get("ZOHO_ORGANIZATION_ID")
         if not self.organization_id:
             logger.warning("ZOHO_ORGANIZATION_ID not set in environment variables")
         
-        # Set up API base URL
+        # Set up API base URL and the organization_id parameter httpx adds to every request
         self.base_url = f"{self.auth.api_domain}/inventory/v1"
+        self._base_params = {"organization_id": self.organization_id} if self.organization_id else {}
+        
+        # Last ETag and parsed body per (endpoint, params), for conditional GETs
+        self._etag_cache = TTLCache(maxsize=256, ttl=ETAG_CACHE_TTL)
+        
+        if self._owner is not self:
+            self._http = self._owner._http
+            self._request_slots = self._owner._request_slots
+            return
+        
+        self._request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
         
-    def _get_api_url(self, endpoint: str) -> str:
+        # Long-lived HTTP client so connections to the API are kept alive and reused;
+        # the async client is created lazily on first async request
+        self._limits = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+        self._http2 = http2_enabled()
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            params=self._base_params,
+            timeout=HTTP_TIMEOUT,
+            # The transport retries failed connection attempts; status retries are in _send
+            transport=httpx.HTTPTransport(retries=CONNECT_RETRIES, limits=self._limits, http2=self._http2)
+        )
+        self._async_http: Optional[httpx.AsyncClient] = None
+        self._async_http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_request_slots: Optional[asyncio.Semaphore] = None
+    
+    def _get_async_http(self) -> httpx.AsyncClient:
+        """Get the AsyncClient for the running event loop, creating it on first use"""
+        if self._owner is not self:
+            return self._owner._get_async_http()
+        loop = asyncio.get_running_loop()
+        if self._async_http is None or self._async_http_loop is not loop:
+            # An AsyncClient's connections belong to the loop that opened them
+            self._async_http = httpx.AsyncClient(
+                base_url=self.base_url,
+                params=self._base_params,
+                timeout=HTTP_TIMEOUT,
+                transport=httpx.AsyncHTTPTransport(retries=CONNECT_RETRIES, limits=self._limits, http2=self._http2)
+            )
+            self._async_http_loop = loop
+            # Like the connections, an asyncio.Semaphore is bound to one loop
+            self._async_request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        return self._async_http
+    
+    def close(self) -> None:
+        """Close the pooled HTTP connections held by this client"""
+        if self._owner is not self:
+            # Shared pools are closed by the client that owns them
+            return
+        self._http.close()
+        self.auth.close()
+    
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP connections held by this client"""
+        if self._owner is not self:
+            return
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+            self._async_http_loop = None
+            self._async_request_slots = None
+    
+    def __enter__(self) -> "ZohoClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        
+    def _build_headers(self, user_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Get the request headers, merging any caller-supplied headers over the auth headers
+        
+        Args:
+            user_headers: Optional extra headers for this request
+            
+        Returns:
+            The shared auth headers dict, or a merged copy when user headers are given
         """
-        Get the full API URL with organization ID if available
+        auth_headers = self.auth.get_headers()
+        if user_headers:
+            return {**auth_headers, **user_headers}
+        return auth_headers
+            
+    def _json(self, response: httpx.Response) -> Any:
+        """
+        Parse a response body as JSON, using orjson when it is installed
+        
+        Args:
+            response: httpx Response object
+            
+        Returns:
+            The parsed JSON body
+        """
+        return json_utils.loads(response.content)
+    
+    def _etag_key(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """Build the cache key for a conditional GET of an endpoint with the given query parameters"""
+        return (endpoint, tuple(sorted(params.items())) if params else ())
+    
+    def _parse_conditional(self, key: Tuple, response: httpx.Response, cached: Optional[Tuple[str, Any]]) -> Any:
+        """
+        Get the body of a conditional GET response, reusing or storing the cached copy
+        
+        Args:
+            key: Cache key from _etag_key
+            response: Response to the (possibly conditional) request
+            cached: The (etag, body) that was sent as If-None-Match, if any
+            
+        Returns:
+            The parsed JSON body
+        """
+        if response.status_code == 304:
+            if cached is None:
+                raise ValueError(f"Not Modified response for {key[0]} without a cached body")
+            logger.debug("Not modified, reusing cached body for %s", key[0])
+            return cached[1]
+        logger.debug("Parsing %s bytes from %s", len(response.content), key[0])
+        data = self._json(response)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache.set(key, (etag, data))
+        return data
+    
+    def get_json_conditional(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET an endpoint, sending If-None-Match so an unchanged body isn't transferred or parsed again
+        
+        The returned object is shared with the cache and must not be modified.
         
         Args:
             endpoint: API endpoint
+            params: Optional query parameters
             
         Returns:
-            Full API URL
+            The parsed JSON body
         """
-        # Add organization_id as a parameter if available
-        if self.organization_id and '?' in endpoint:
-            return f"{self.base_url}/{endpoint}&organization_id={self.organization_id}"
-        elif self.organization_id:
-            return f"{self.base_url}/{endpoint}?organization_id={self.organization_id}"
-        else:
-            return f"{self.base_url}/{endpoint}"
+        key = self._etag_key(endpoint, params)
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.make_api_request("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached is None:
+            # Nothing to reuse (e.g. a cache in between answered), so ask for the full body
+            logger.warning("Received 304 for %s without a cached body, requesting it again", endpoint)
+            response = self.make_api_request("GET", endpoint, params=params, headers=NO_CACHE_HEADERS)
+        return self._parse_conditional(key, response, cached)
+    
+    async def get_json_conditional_async(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET an endpoint like get_json_conditional without blocking the event loop
+        
+        Args:
+            endpoint: API endpoint
+            params: Optional query parameters
+            
+        Returns:
+            The parsed JSON body
+        """
+        key = self._etag_key(endpoint, params)
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = await self.make_api_request_async("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached is None:
+            logger.warning("Received 304 for %s without a cached body, requesting it again", endpoint)
+            response = await self.make_api_request_async("GET", endpoint, params=params, headers=NO_CACHE_HEADERS)
+        return self._parse_conditional(key, response, cached)
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """
+        Get how long to wait before retrying a request
+        
+        Args:
+            response: Response that will be retried
+            attempt: Number of the attempt that got the response, starting at 0
+            
+        Returns:
+            Seconds to wait: the server's Retry-After (capped at MAX_RETRY_AFTER) if it
+            sent one, otherwise the exponential backoff
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # The header may also be an HTTP date
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), MAX_RETRY_AFTER)
+        return RETRY_BACKOFF * (2 ** attempt)
+    
+    def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying on throttling, and for idempotent methods on transient server errors
+        
+        Args:
+            method: HTTP method to use
+            url: Request URL, relative to base_url
+            **kwargs: Additional arguments to pass to httpx
+            
+        Returns:
+            httpx Response object of the last attempt
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(STATUS_RETRIES + 1):
+            # The slot is held for the request only, not while waiting to retry
+            with self._request_slots:
+                response = self._http.request(method, url, **kwargs)
+            if attempt == STATUS_RETRIES or not _should_retry(response.status_code, idempotent):
+                return response
+            delay = self._retry_delay(response, attempt)
+            logger.warning("Received %s from %s, retrying in %.1fs", response.status_code, url, delay)
+            time.sleep(delay)
+        return response
+    
+    async def _send_async(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request without blocking the event loop, retrying like _send
+        
+        Args:
+            client: The AsyncClient for the running event loop
+            method: HTTP method to use
+            url: Request URL, relative to base_url
+            **kwargs: Additional arguments to pass to httpx
             
+        Returns:
+            httpx Response object of the last attempt
+        """
+        # Created with the AsyncClient for the running loop
+        request_slots = self._owner._async_request_slots
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(STATUS_RETRIES + 1):
+            async with request_slots:
+                response = await client.request(method, url, **kwargs)
+            if attempt == STATUS_RETRIES or not _should_retry(response.status_code, idempotent):
+                return response
+            delay = self._retry_delay(response, attempt)
+            logger.warning("Received %s from %s, retrying in %.1fs", response.status_code, url, delay)
+            await asyncio.sleep(delay)
+        return response
+    
     def make_api_request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
         """
         Make an API request with automatic token refresh if needed
@@ -69,58 +358,112 @@ class ZohoClient:
         if not self.auth.ensure_valid_token():
             raise ValueError("Failed to obtain a valid access token")
         
-        url = self._get_api_url(endpoint)
-        logger.info(f"Making API request to: {url}")
+        # Relative to base_url; httpx adds the organization_id parameter
+        url = endpoint
+        logger.info("Making API request to: %s", url)
         
-        with httpx.Client() as client:
-            # First attempt
-            try:
-                # Ensure headers from kwargs don't conflict with auth headers
-                request_headers = self.auth.get_headers().copy()
-                if 'headers' in kwargs:
-                    # Merge headers
-                    user_headers = kwargs.pop('headers')
-                    request_headers.update(user_headers)
-                
-                response = client.request(
-                    method, 
-                    url, 
-                    headers=request_headers, 
-                    **kwargs
-                )
-                
-                # If token is expired (401), refresh and retry
-                if response.status_code == 401:
-                    logger.info("Received 401, refreshing token and retrying")
-                    if self.auth.refresh_access_token():
-                        # Update request headers with new token
-                        request_headers = self.auth.get_headers().copy()
-                        if 'headers' in kwargs:
-                            user_headers = kwargs.pop('headers')
-                            request_headers.update(user_headers)
-                            
-                        # Retry the request with refreshed token
-                        logger.info(f"Retrying API request with refreshed token to: {url}")
-                        response = client.request(
-                            method, 
-                            url, 
-                            headers=request_headers, 
-                            **kwargs
-                        )
-                
-                if response.status_code >= 400:
-                    logger.error(f"API error: {response.status_code} {response.text}")
-                
-                response.raise_for_status()
+        user_headers = kwargs.pop('headers', None)
+        # First attempt
+        try:
+            # Reuse the cached auth headers unless the caller supplied extra ones
+            request_headers = self._build_headers(user_headers)
+            
+            response = self._send(
+                method, 
+                url, 
+                headers=request_headers, 
+                **kwargs
+            )
+            
+            # If token is expired (401), refresh and retry
+            if response.status_code == 401:
+                logger.info("Received 401, refreshing token and retrying")
+                if self.auth.refresh_access_token():
+                    # Update request headers with new token
+                    request_headers = self._build_headers(user_headers)
+                        
+                    # Retry the request with refreshed token
+                    logger.info("Retrying API request with refreshed token to: %s", url)
+                    response = self._send(
+                        method, 
+                        url, 
+                        headers=request_headers, 
+                        **kwargs
+                    )
+            
+            # Not Modified answers a conditional GET; the caller reuses its cached body
+            if response.status_code == 304:
                 return response
-                
-            except httpx.HTTPStatusError as e:
-                # If we still get 401 after refresh attempt, raise the error
-                if e.response.status_code == 401:
-                    logger.error(f"Authentication failed: {e.response.text}")
-                    raise ValueError("Authentication failed: Invalid credentials or insufficient permissions")
-                logger.error(f"HTTP error: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Request error: {e}")
-                raise 
\ No newline at end of file
+            
+            response.raise_for_status()
+            return response
+            
+        except httpx.HTTPStatusError as e:
+            logger.error("API error: %s %s", e.response.status_code, e.response.text)
+            # If we still get 401 after refresh attempt, raise the error
+            if e.response.status_code == 401:
+                logger.error("Authentication failed: %s", e.response.text)
+                raise ValueError("Authentication failed: Invalid credentials or insufficient permissions")
+            logger.error("HTTP error: %s", e)
+            raise
+        except httpx.HTTPError as e:
+            logger.error("Request error: %s", e)
+            raise
+    
+    async def make_api_request_async(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Make an API request without blocking the event loop, with automatic token refresh if needed
+        
+        Independent requests can be awaited together with asyncio.gather.
+        
+        Args:
+            method: HTTP method to use
+            endpoint: API endpoint
+            **kwargs: Additional arguments to pass to httpx
+            
+        Returns:
+            httpx Response object
+            
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        if not await self.auth.ensure_valid_token_async():
+            raise ValueError("Failed to obtain a valid access token")
+        
+        url = endpoint
+        logger.info("Making async API request to: %s", url)
+        
+        client = self._get_async_http()
+        user_headers = kwargs.pop('headers', None)
+        try:
+            request_headers = self._build_headers(user_headers)
+            
+            response = await self._send_async(client, method, url, headers=request_headers, **kwargs)
+            
+            # If token is expired (401), refresh and retry
+            if response.status_code == 401:
+                logger.info("Received 401, refreshing token and retrying")
+                if await self.auth.refresh_access_token_async():
+                    request_headers = self._build_headers(user_headers)
+                    
+                    logger.info("Retrying async API request with refreshed token to: %s", url)
+                    response = await self._send_async(client, method, url, headers=request_headers, **kwargs)
+            
+            # Not Modified answers a conditional GET; the caller reuses its cached body
+            if response.status_code == 304:
+                return response
+            
+            response.raise_for_status()
+            return response
+            
+        except httpx.HTTPStatusError as e:
+            logger.error("API error: %s %s", e.response.status_code, e.response.text)
+            # If we still get 401 after refresh attempt, raise the error
+            if e.response.status_code == 401:
+                logger.error("Authentication failed: %s", e.response.text)
+                raise ValueError("Authentication failed: Invalid credentials or insufficient permissions")
+            logger.error("HTTP error: %s", e)
+            raise
+        except httpx.HTTPError as e:
+            logger.error("Request error: %s", e)
+            raise
\ No newline at end of file
@@ -1,41 +1,270 @@
+import os
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import time
+import httpx
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+from .cache import TTLCache
 from .client import ZohoClient
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Page size for name/SKU lookups; the API filters server-side, so only a few
+# candidates (e.g. case variants of a name) need to come back for the exact-match check
+LOOKUP_PAGE_SIZE = 10
+
+# Seconds that item and stock lookups are reused before hitting the API again
+ITEM_CACHE_TTL = 30
+
+# Page size for listing all items; 200 is the largest page the API returns
+LIST_PAGE_SIZE = 200
+
+@lru_cache(maxsize=1)
+def _today_str(epoch_minute: int) -> str:
+    """
+    Get today's date as YYYY-MM-DD, recomputed at most once per minute
+    
+    Args:
+        epoch_minute: Current Unix time in whole minutes, used as the cache key
+        
+    Returns:
+        Today's date in ISO format
+    """
+    return date.today().isoformat()
+
+def _first_match(items: Iterable[Dict[str, Any]], field: str, value: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the first item whose field equals value
+    
+    Args:
+        items: Items to search, in API order
+        field: Item field to compare
+        value: Value the field must equal
+        
+    Returns:
+        The first matching item, or None
+    """
+    for item in items:
+        if item.get(field) == value:
+            return item
+    return None
+
 class ItemClient(ZohoClient):
     """Client for interacting with Zoho Inventory Items API"""
     
-    def get_item_by_name(self, name: str) -> Dict[str, Any]:
+    def __init__(self, 
+                 refresh_token: Optional[str] = None,
+                 client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None,
+                 share_with: Optional[ZohoClient] = None):
         """
-        Get inventory item details by name
+        Initialize the item client
         
         Args:
-            name: Name of the inventory item
+            refresh_token: Refresh token for getting new access tokens, if None will try to get from environment
+            client_id: Client ID for OAuth, if None will try to get from environment
+            client_secret: Client Secret for OAuth, if None will try to get from environment
+            share_with: Existing client whose authentication and connection pools are reused
+        """
+        super().__init__(refresh_token, client_id, client_secret, share_with)
+        
+        # Short-lived lookup caches keyed by name, SKU and (item_id, location_id);
+        # entries for an item are dropped as soon as its stock is changed through this client
+        self._name_cache = TTLCache(maxsize=4096, ttl=ITEM_CACHE_TTL)
+        self._sku_cache = TTLCache(maxsize=4096, ttl=ITEM_CACHE_TTL)
+        self._stock_cache = TTLCache(maxsize=4096, ttl=ITEM_CACHE_TTL)
+        
+        # Re-fetch and log warehouse details when an override turns out to be a no-op
+        self._debug_zero_adjust = os.environ.get("ZOHO_DEBUG_ZERO_ADJUST", "").lower() in ("1", "true", "yes")
+    
+    def _invalidate_item(self, item_id: str) -> None:
+        """
+        Drop every cached lookup for an item after it was changed
+        
+        Args:
+            item_id: ID of the inventory item
+        """
+        self._stock_cache.discard_where(lambda key, _: key[0] == item_id)
+        self._name_cache.discard_where(lambda _, item: item.get("item_id") == item_id)
+        self._sku_cache.discard_where(lambda _, item: item.get("item_id") == item_id)
+    
+    def invalidate_sku(self, sku: str) -> None:
+        """
+        Drop the cached lookup for a SKU
+        
+        Args:
+            sku: SKU of the inventory item
+        """
+        item = self._sku_cache.pop(sku)
+        if item:
+            self._invalidate_item(item.get("item_id"))
+    
+    def _remember_items(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Seed the name and SKU lookup caches from a full item listing
+        
+        Args:
+            items: All inventory items, in API order
+        """
+        # Stored from the end so the first item wins for duplicate names, like the API lookup
+        for item in reversed(items):
+            name = item.get("name")
+            if name:
+                self._name_cache.set(name, item)
+            sku = item.get("sku")
+            if sku:
+                self._sku_cache.set(sku, item)
+    
+    def _build_adjustment_payload(self, adjustments: List[Tuple[str, int, Optional[str]]], reason: str) -> Dict[str, Any]:
+        """
+        Build the inventoryadjustments request body
+        
+        Args:
+            adjustments: (item_id, quantity, location_id) tuples, one line item each;
+                quantity is the signed adjustment and location_id may be None
+            reason: Reason for the adjustment
             
         Returns:
-            Item details as dictionary
+            Request payload as dictionary
+        """
+        line_items = []
+        for item_id, quantity, location_id in adjustments:
+            line_item = {
+                "item_id": item_id,
+                "quantity_adjusted": quantity
+            }
+            # Add location_id to the line item if provided
+            if location_id:
+                line_item["warehouse_id"] = location_id
+            line_items.append(line_item)
+        
+        return {
+            "adjustment_type": "quantity",
+            "reason": reason,
+            "date": _today_str(int(time.time()) // 60),
+            "line_items": line_items
+        }
+    
+    def _stock_from_item(self, item: Dict[str, Any], item_id: str, location_id: Optional[str]) -> int:
+        """
+        Read the available stock from an item's details
+        
+        Args:
+            item: Item details as returned by the items/{item_id} endpoint
+            item_id: ID of the inventory item, for logging
+            location_id: Optional ID of the warehouse location
+            
+        Returns:
+            Available stock at the location, or overall if no location is given
+        """
+        # If location_id is provided, find stock for that specific warehouse
+        if location_id and "warehouses" in item:
+            warehouses = item.get("warehouses", [])
+            by_id = {w.get("warehouse_id"): w for w in warehouses}
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %s warehouses for item %s: %s", len(warehouses), item_id, list(by_id))
+            
+            warehouse = by_id.get(location_id)
+            if warehouse is not None:
+                available_stock = int(float(warehouse.get("warehouse_available_stock", 0)))
+                logger.debug("Found matching warehouse. Available stock: %s", available_stock)
+                return available_stock
+            
+            # If warehouse not found in details, return 0
+            logger.warning("Warehouse with ID %s not found in warehouse details for item %s", location_id, item_id)
+            return 0
+            
+        # Return overall available stock if no location specified or warehouse details not available
+        available_stock = int(float(item.get("available_stock", 0)))
+        logger.debug("Using overall available stock: %s", available_stock)
+        return available_stock
+    
+    def _match_item(self, data: Dict[str, Any], field: str, value: str, cache: TTLCache) -> Dict[str, Any]:
+        """
+        Pick the item whose field matches exactly from an items search response
+        
+        Args:
+            data: Parsed items search response
+            field: Item field that was searched on ("name" or "sku")
+            value: Value the field must equal
+            cache: Lookup cache to store a match in
+            
+        Returns:
+            Item details as dictionary, or {} if nothing matched
+        """
+        item = _first_match(data.get("items") or (), field, value)
+        if item is None:
+            logger.debug("No exact %s match for %s in API response: %s", field, value, data)
+            return {}
+        
+        cache.set(value, item)
+        return item
+    
+    def _find_item(self, field: str, value: str, cache: TTLCache) -> Dict[str, Any]:
         """
+        Look up an item by an exact field value, using the cache when possible
+        
+        Args:
+            field: Item field and query parameter to search on ("name" or "sku")
+            value: Value the field must equal
+            cache: Lookup cache for this field
+            
+        Returns:
+            Item details as dictionary, or {} if not found
+        """
+        cached = cache.get(value)
+        if cached is not None:
+            return cached
+        
         # Log the operation
-        logger.info(f"Getting item by name: {name}")
+        logger.info("Getting item by %s: %s", field, value)
         
         response = self.make_api_request(
             "GET",
             "items",
-            params={"name": name}
+            params={field: value, "per_page": LOOKUP_PAGE_SIZE}
         )
+        return self._match_item(self._json(response), field, value, cache)
+    
+    async def _find_item_async(self, field: str, value: str, cache: TTLCache) -> Dict[str, Any]:
+        """
+        Look up an item by an exact field value without blocking the event loop
         
-        data = response.json()
-        logger.info(f"API response for get_item_by_name: {data}")
+        Args:
+            field: Item field and query parameter to search on ("name" or "sku")
+            value: Value the field must equal
+            cache: Lookup cache for this field
+            
+        Returns:
+            Item details as dictionary, or {} if not found
+        """
+        cached = cache.get(value)
+        if cached is not None:
+            return cached
         
-        items = data.get("items", [])
-        for item in items:
-            if item.get("name") == name:
-                return item
-                
-        return {}
+        logger.info("Getting item by %s (async): %s", field, value)
+        
+        response = await self.make_api_request_async(
+            "GET",
+            "items",
+            params={field: value, "per_page": LOOKUP_PAGE_SIZE}
+        )
+        return self._match_item(self._json(response), field, value, cache)
+    
+    def get_item_by_name(self, name: str) -> Dict[str, Any]:
+        """
+        Get inventory item details by name
+        
+        Args:
+            name: Name of the inventory item
+            
+        Returns:
+            Item details as dictionary
+        """
+        return self._find_item("name", name, self._name_cache)
     
     def get_item_by_sku(self, sku: str) -> Dict[str, Any]:
         """
@@ -47,24 +276,40 @@ class ItemClient(ZohoClient):
         Returns:
             Item details as dictionary
         """
-        # Log the operation
-        logger.info(f"Getting item by SKU: {sku}")
-        
-        response = self.make_api_request(
-            "GET",
-            "items",
-            params={"sku": sku}
-        )
+        return self._find_item("sku", sku, self._sku_cache)
+    
+    def iter_items(self, page_size: int = LIST_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all inventory items, fetching one page at a time
         
-        data = response.json()
-        logger.info(f"API response for get_item_by_sku: {data}")
+        Args:
+            page_size: Number of items requested per page (Zoho allows at most 200)
+            
+        Yields:
+            Inventory items in API order
+        """
+        # Log the operation
+        logger.info("Getting all items")
         
-        items = data.get("items", [])
-        for item in items:
-            if item.get("sku") == sku:
-                return item
+        page = 1
+        while True:
+            data = self.get_json_conditional("items", {"page": page, "per_page": page_size})
+            
+            # Log response preview (limited to prevent excessive logging)
+            if logger.isEnabledFor(logging.INFO):
+                preview = {k: v for k, v in data.items() if k != 'items'}
+                if 'items' in data:
+                    preview['items_count'] = len(data['items'])
+                    if data['items']:
+                        preview['first_item_preview'] = data['items'][0]['name'] if 'name' in data['items'][0] else '(no name)'
                 
-        return {}
+                logger.info("API response summary for list page %s: %s", page, preview)
+            
+            yield from data.get("items", [])
+            
+            if not data.get("page_context", {}).get("has_more_page"):
+                return
+            page += 1
     
     def list(self) -> List[Dict[str, Any]]:
         """
@@ -73,22 +318,9 @@ class ItemClient(ZohoClient):
         Returns:
             List of all inventory items
         """
-        # Log the operation
-        logger.info("Getting all items")
-        
-        response = self.make_api_request("GET", "items")
-        data = response.json()
-        
-        # Log response preview (limited to prevent excessive logging)
-        preview = {k: v for k, v in data.items() if k != 'items'}
-        if 'items' in data:
-            preview['items_count'] = len(data['items'])
-            if data['items']:
-                preview['first_item_preview'] = data['items'][0]['name'] if 'name' in data['items'][0] else '(no name)'
-        
-        logger.info(f"API response summary for list: {preview}")
-        
-        return data.get("items", [])
+        items = list(self.iter_items())
+        self._remember_items(items)
+        return items
     
     def update_item_stock(self, name: str, stock_on_hand: int) -> Dict[str, Any]:
         """
@@ -114,7 +346,8 @@ class ItemClient(ZohoClient):
             f"items/{item_id}",
             json={"stock_on_hand": stock_on_hand}
         )
-        return response.json().get("item", {})
+        self._invalidate_item(item_id)
+        return self._json(response).get("item", {})
         
     def adjust_inventory_by_item_id(self, item_id: str, quantity: int, reason: str = "Stock update via API", location_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -130,25 +363,9 @@ class ItemClient(ZohoClient):
             Adjustment details
         """
         # Log the operation
-        logger.info(f"Adjusting inventory for item ID: {item_id}, quantity: {quantity}, location_id: {location_id}")
-        
-        from datetime import datetime
-        
-        payload = {
-            "adjustment_type": "quantity",
-            "reason": reason,
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "line_items": [
-                {
-                    "item_id": item_id,
-                    "quantity_adjusted": quantity
-                }
-            ]
-        }
+        logger.info("Adjusting inventory for item ID: %s, quantity: %s, location_id: %s", item_id, quantity, location_id)
         
-        # Add location_id to the line item if provided
-        if location_id:
-            payload["line_items"][0]["warehouse_id"] = location_id
+        payload = self._build_adjustment_payload([(item_id, quantity, location_id)], reason)
         
         response = self.make_api_request(
             "POST",
@@ -156,62 +373,47 @@ class ItemClient(ZohoClient):
             json=payload
         )
         
-        data = response.json()
-        logger.info(f"API response for adjust_inventory_by_item_id: {data}")
+        self._invalidate_item(item_id)
+        
+        data = self._json(response)
+        logger.debug("API response for adjust_inventory_by_item_id: %s", data)
         
         return data.get("inventoryadjustment", {})
 
-    def get_item_stock_by_id(self, item_id: str, location_id: Optional[str] = None) -> int:
+    def get_item_stock_by_id(self, item_id: str, location_id: Optional[str] = None, use_cache: bool = True) -> int:
         """
         Get current stock quantity for an item by ID
         
         Args:
             item_id: ID of the inventory item
             location_id: Optional ID of the warehouse location
+            use_cache: Whether a recently read quantity may be returned; pass False when
+                the value feeds an adjustment, where a stale quantity would write the wrong stock
             
         Returns:
             Current stock quantity as integer
         """
-        logger.info(f"Getting stock quantity for item ID: {item_id}, location_id: {location_id}")
+        if use_cache:
+            cached = self._stock_cache.get((item_id, location_id))
+            if cached is not None:
+                return cached
+        
+        logger.info("Getting stock quantity for item ID: %s, location_id: %s", item_id, location_id)
         
         # Build the API endpoint
         endpoint = f"items/{item_id}"
         
         response = self.make_api_request("GET", endpoint)
-        data = response.json()
+        data = self._json(response)
         
         # More detailed logging of API response
-        logger.info(f"API response code for get_item_stock_by_id: {data.get('code')}")
+        logger.info("API response code for get_item_stock_by_id: %s", data.get('code'))
         
-        item = data.get("item", {})
-        
-        # If location_id is provided, find stock for that specific warehouse
-        if location_id and "warehouses" in item:
-            warehouses = item.get("warehouses", [])
-            logger.info(f"Found {len(warehouses)} warehouses for item {item_id}")
-            
-            # Log all available warehouses for debugging
-            warehouse_ids = [w.get("warehouse_id") for w in warehouses]
-            logger.info(f"Available warehouse IDs: {warehouse_ids}")
-            
-            for warehouse in warehouses:
-                warehouse_id = warehouse.get("warehouse_id")
-                logger.info(f"Checking warehouse {warehouse_id} against requested location_id {location_id}")
-                if warehouse_id == location_id:
-                    available_stock = int(float(warehouse.get("warehouse_available_stock", 0)))
-                    logger.info(f"Found matching warehouse. Available stock: {available_stock}")
-                    return available_stock
-            
-            # If warehouse not found in details, return 0
-            logger.warning(f"Warehouse with ID {location_id} not found in warehouse details for item {item_id}")
-            return 0
-            
-        # Return overall available stock if no location specified or warehouse details not available
-        available_stock = int(float(item.get("available_stock", 0)))
-        logger.info(f"Using overall available stock: {available_stock}")
-        return available_stock
+        stock = self._stock_from_item(data.get("item", {}), item_id, location_id)
+        self._stock_cache.set((item_id, location_id), stock)
+        return stock
     
-    def override_item_stock_by_id(self, item_id: str, target_quantity: int, reason: str = "Stock override via API", location_id: Optional[str] = None) -> Dict[str, Any]:
+    def override_item_stock_by_id(self, item_id: str, target_quantity: int, reason: str = "Stock override via API", location_id: Optional[str] = None, current_quantity: Optional[int] = None) -> Dict[str, Any]:
         """
         Override inventory quantity for an item by ID to an exact value
         
@@ -220,35 +422,291 @@ class ItemClient(ZohoClient):
             target_quantity: Exact quantity to set
             reason: Reason for the adjustment
             location_id: Optional ID of the warehouse location
+            current_quantity: Current stock if the caller already knows it, which skips fetching it
             
         Returns:
             Adjustment details
         """
         # Log the operation
-        logger.info(f"Overriding stock for item ID: {item_id} to quantity: {target_quantity}, location_id: {location_id}")
+        logger.info("Overriding stock for item ID: %s to quantity: %s, location_id: %s", item_id, target_quantity, location_id)
         
-        # Get current stock quantity
-        current_quantity = self.get_item_stock_by_id(item_id, location_id)
-        logger.info(f"Current stock quantity for item ID {item_id}: {current_quantity}")
+        # Get current stock quantity unless the caller supplied it; always read fresh,
+        # since the override is sent as a delta from this value
+        if current_quantity is None:
+            current_quantity = self.get_item_stock_by_id(item_id, location_id, use_cache=False)
+        logger.info("Current stock quantity for item ID %s: %s", item_id, current_quantity)
         
         # Calculate adjustment needed
         adjustment = target_quantity - current_quantity
-        logger.info(f"Adjustment needed to reach target quantity: {adjustment}")
+        logger.info("Adjustment needed to reach target quantity: %s", adjustment)
         
-        # Additional debugging for zero adjustments
+        # Skip zero adjustments, which would result in a 400 error from Zoho API
         if adjustment == 0:
-            logger.warning(f"Zero adjustment detected for item ID {item_id} with location_id {location_id}. Current and target quantities are both {current_quantity}.")
-            if location_id:
-                logger.info(f"Attempting to fetch more detailed warehouse information for location_id {location_id}")
+            logger.debug("Zero adjustment for item %s location %s; skipping", item_id, location_id)
+            if self._debug_zero_adjust and location_id:
+                # Diagnostic re-fetch, only when ZOHO_DEBUG_ZERO_ADJUST is set
                 response = self.make_api_request("GET", f"items/{item_id}")
-                data = response.json()
-                warehouse_details = data.get("item", {}).get("warehouse_details", [])
-                logger.info(f"Full warehouse details for item: {warehouse_details}")
+                warehouse_details = self._json(response).get("item", {}).get("warehouse_details", [])
+                logger.info("Full warehouse details for item %s: %s", item_id, warehouse_details)
+            return {"warning": "No adjustment made - current stock already matches target quantity", "current_quantity": current_quantity}
+        
+        # Make the adjustment
+        return self.adjust_inventory_by_item_id(item_id, adjustment, reason, location_id)
+    
+    # Async variants, for callers that want to await several lookups concurrently
+    
+    async def get_item_by_name_async(self, name: str) -> Dict[str, Any]:
+        """
+        Get inventory item details by name without blocking the event loop
+        
+        Args:
+            name: Name of the inventory item
+            
+        Returns:
+            Item details as dictionary
+        """
+        return await self._find_item_async("name", name, self._name_cache)
+    
+    async def get_item_by_sku_async(self, sku: str) -> Dict[str, Any]:
+        """
+        Get inventory item details by SKU without blocking the event loop
+        
+        Args:
+            sku: SKU of the inventory item
+            
+        Returns:
+            Item details as dictionary
+        """
+        return await self._find_item_async("sku", sku, self._sku_cache)
+    
+    async def get_items_bulk(self, names: List[str]) -> List[Any]:
+        """
+        Get several inventory items by name concurrently
+        
+        Args:
+            names: Names of the inventory items
+            
+        Returns:
+            Item details (or {} if not found) in the order of names; a lookup
+            that failed yields its exception instead of raising
+        """
+        return await asyncio.gather(
+            *(self.get_item_by_name_async(name) for name in names),
+            return_exceptions=True
+        )
+    
+    async def list_async(self) -> List[Dict[str, Any]]:
+        """
+        Get all inventory items without blocking the event loop
+        
+        Returns:
+            List of all inventory items
+        """
+        logger.info("Getting all items (async)")
+        
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            return await self.get_json_conditional_async("items", {"page": page, "per_page": LIST_PAGE_SIZE})
+        
+        data = await fetch_page(1)
+        # Copy the page; the conditional GET shares its body with the ETag cache
+        items = list(data.get("items", []))
+        page_context = data.get("page_context", {})
+        total = page_context.get("total")
+        if page_context.get("has_more_page") and total:
+            # The page count is known, so fetch the remaining pages concurrently
+            page_count = -(-int(total) // LIST_PAGE_SIZE)
+            for page_data in await asyncio.gather(*(fetch_page(page) for page in range(2, page_count + 1))):
+                items.extend(page_data.get("items", []))
+        else:
+            # Without a total, follow has_more_page one page at a time
+            page = 1
+            while data.get("page_context", {}).get("has_more_page"):
+                page += 1
+                data = await fetch_page(page)
+                items.extend(data.get("items", []))
+        
+        self._remember_items(items)
+        return items
+    
+    async def update_item_stock_async(self, name: str, stock_on_hand: int) -> Dict[str, Any]:
+        """
+        Update the stock level for an item by name without blocking the event loop
+        
+        Args:
+            name: Name of the inventory item
+            stock_on_hand: New stock level
+            
+        Returns:
+            Updated item details
+        """
+        item = await self.get_item_by_name_async(name)
+        if not item:
+            raise ValueError(f"Item not found: {name}")
+        
+        item_id = item.get("item_id")
+        response = await self.make_api_request_async(
+            "PUT",
+            f"items/{item_id}",
+            json={"stock_on_hand": stock_on_hand}
+        )
+        self._invalidate_item(item_id)
+        return self._json(response).get("item", {})
+    
+    async def adjust_inventory_by_item_id_async(self, item_id: str, quantity: int, reason: str = "Stock update via API", location_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Adjust inventory quantity for an item by ID without blocking the event loop
         
-        # Make the adjustment if not zero
+        Args:
+            item_id: ID of the inventory item
+            quantity: Quantity to adjust (positive or negative)
+            reason: Reason for the adjustment
+            location_id: Optional ID of the warehouse location
+            
+        Returns:
+            Adjustment details
+        """
+        logger.info("Adjusting inventory (async) for item ID: %s, quantity: %s, location_id: %s", item_id, quantity, location_id)
+        
+        response = await self.make_api_request_async(
+            "POST",
+            "inventoryadjustments",
+            json=self._build_adjustment_payload([(item_id, quantity, location_id)], reason)
+        )
+        self._invalidate_item(item_id)
+        return self._json(response).get("inventoryadjustment", {})
+    
+    async def get_item_stock_by_id_async(self, item_id: str, location_id: Optional[str] = None, use_cache: bool = True) -> int:
+        """
+        Get current stock quantity for an item by ID without blocking the event loop
+        
+        Args:
+            item_id: ID of the inventory item
+            location_id: Optional ID of the warehouse location
+            use_cache: Whether a recently read quantity may be returned; see get_item_stock_by_id
+            
+        Returns:
+            Current stock quantity as integer
+        """
+        if use_cache:
+            cached = self._stock_cache.get((item_id, location_id))
+            if cached is not None:
+                return cached
+        
+        response = await self.make_api_request_async("GET", f"items/{item_id}")
+        stock = self._stock_from_item(self._json(response).get("item", {}), item_id, location_id)
+        self._stock_cache.set((item_id, location_id), stock)
+        return stock
+    
+    async def override_item_stock_by_id_async(self, item_id: str, target_quantity: int, reason: str = "Stock override via API", location_id: Optional[str] = None, current_quantity: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Override inventory quantity for an item by ID to an exact value without blocking the event loop
+        
+        Args:
+            item_id: ID of the inventory item
+            target_quantity: Exact quantity to set
+            reason: Reason for the adjustment
+            location_id: Optional ID of the warehouse location
+            current_quantity: Current stock if the caller already knows it, which skips fetching it
+            
+        Returns:
+            Adjustment details
+        """
+        # The override is sent as a delta, so the current stock is always read fresh
+        if current_quantity is None:
+            current_quantity = await self.get_item_stock_by_id_async(item_id, location_id, use_cache=False)
+        adjustment = target_quantity - current_quantity
+        
+        # A zero adjustment would be rejected with a 400 by the Zoho API
         if adjustment == 0:
-            logger.warning("Skipping inventory adjustment as quantity difference is zero. This would result in a 400 error from Zoho API.")
+            logger.warning("Skipping inventory adjustment for item ID %s: stock already at %s", item_id, current_quantity)
             return {"warning": "No adjustment made - current stock already matches target quantity", "current_quantity": current_quantity}
         
-        # Make the adjustment
-        return self.adjust_inventory_by_item_id(item_id, adjustment, reason, location_id) 
\ No newline at end of file
+        return await self.adjust_inventory_by_item_id_async(item_id, adjustment, reason, location_id)
+    
+    async def adjust_inventory_bulk_async(self, adjustments: List[Tuple[str, int, Optional[str]]], reason: str = "Stock update via API") -> Dict[str, Any]:
+        """
+        Adjust inventory for several items in a single inventoryadjustments request
+        
+        Args:
+            adjustments: (item_id, quantity, location_id) tuples; quantity is the
+                signed adjustment and location_id may be None
+            reason: Reason for the adjustment
+            
+        Returns:
+            Adjustment details
+        """
+        logger.info("Adjusting inventory (async) for %s line items in one request", len(adjustments))
+        
+        response = await self.make_api_request_async(
+            "POST",
+            "inventoryadjustments",
+            json=self._build_adjustment_payload(adjustments, reason)
+        )
+        
+        for item_id, _, _ in adjustments:
+            self._invalidate_item(item_id)
+        
+        return self._json(response).get("inventoryadjustment", {})
+    
+    async def override_item_stock_bulk_async(self, targets: List[Tuple[str, int, Optional[str]]], reason: str = "Stock override via API") -> List[Any]:
+        """
+        Override inventory quantities for several items to exact values with one adjustment
+        
+        Current stock levels are read concurrently, as far as the client's request
+        limit allows, then every non-zero difference is sent as a line item of a
+        single inventory adjustment. If Zoho rejects that adjustment, each item is
+        overridden on its own, so only the offending items fail.
+        
+        Args:
+            targets: (item_id, target_quantity, location_id) tuples; location_id may be None
+            reason: Reason for the adjustment
+            
+        Returns:
+            Result per target, in the order of targets: the adjustment details, a warning
+            dictionary if the stock already matched, or the exception that made the target fail
+        """
+        current_quantities = await asyncio.gather(
+            *(self.get_item_stock_by_id_async(item_id, location_id, use_cache=False) for item_id, _, location_id in targets),
+            return_exceptions=True
+        )
+        
+        results: List[Any] = list(current_quantities)
+        pending = []
+        for i, ((item_id, target_quantity, location_id), current_quantity) in enumerate(zip(targets, current_quantities)):
+            if isinstance(current_quantity, BaseException):
+                continue
+            if target_quantity == current_quantity:
+                # Zero line items would be rejected with a 400 by the Zoho API
+                results[i] = {"warning": "No adjustment made - current stock already matches target quantity", "current_quantity": current_quantity}
+            else:
+                pending.append(i)
+        
+        if not pending:
+            logger.info("Skipping bulk inventory adjustment as every item already matches its target")
+            return results
+        
+        try:
+            adjustment = await self.adjust_inventory_bulk_async(
+                [(targets[i][0], targets[i][1] - current_quantities[i], targets[i][2]) for i in pending],
+                reason
+            )
+        except Exception as e:
+            rejected = isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+            if not rejected or len(pending) == 1:
+                # Any other failure may have left the adjustment applied, so it is not sent again
+                for i in pending:
+                    results[i] = e
+                return results
+            
+            logger.warning("Bulk inventory adjustment rejected (%s); adjusting the %s items one by one", e.response.status_code, len(pending))
+            overrides = await asyncio.gather(
+                *(self.override_item_stock_by_id_async(targets[i][0], targets[i][1], reason, targets[i][2], current_quantities[i]) for i in pending),
+                return_exceptions=True
+            )
+            for i, result in zip(pending, overrides):
+                results[i] = result
+            return results
+        
+        for i in pending:
+            results[i] = adjustment
+        return results
\ No newline at end of file
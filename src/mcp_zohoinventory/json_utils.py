@@ -0,0 +1,55 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup (the "speedups" extra)
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so catching this covers both parsers
+JSONDecodeError = json.JSONDecodeError
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed
+    
+    Args:
+        data: JSON text or UTF-8 encoded bytes
+        
+    Returns:
+        The parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 encoded JSON, using orjson when it is installed
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when it is installed
+    
+    Args:
+        obj: The object to serialize
+        pretty: Indent the output by two spaces instead of writing it compactly
+        
+    Returns:
+        The JSON document as text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
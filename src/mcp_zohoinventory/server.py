@@ -1,79 +1,171 @@
+import os
+import asyncio
+import functools
 import urllib.parse
 import logging
+import threading
+import anyio
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+from mcp_zohoinventory import json_utils
+from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Responses are parsed by programs, so they are compact unless ZOHO_MCP_PRETTY is set
+PRETTY_OUTPUT = os.environ.get("ZOHO_MCP_PRETTY", "").lower() in ("1", "true", "yes")
+
+# Shared client, created on first use so its token and connection pool are reused across requests
+_client: Optional[ZohoInventoryClient] = None
+_client_lock = threading.Lock()
+_active_sessions = 0
+
+def _get_client() -> ZohoInventoryClient:
+    """
+    Get the shared Zoho Inventory client, creating it on first use
+    
+    Returns:
+        The process-wide ZohoInventoryClient
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ZohoInventoryClient()
+    return _client
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Create the shared client (and its token) on startup and close its connections after the last session"""
+    global _client, _active_sessions
+    try:
+        await asyncio.to_thread(_get_client)
+    except Exception as e:
+        # Handlers retry the initialization, so the server can still start
+        logger.warning("Could not initialize Zoho client on startup: %s", e)
+    with _client_lock:
+        _active_sessions += 1
+    try:
+        yield
+    finally:
+        # The lifespan runs once per session under SSE, so only the last one closes the client
+        with _client_lock:
+            _active_sessions -= 1
+            client = _client if _active_sessions == 0 else None
+            if client is not None:
+                _client = None
+        if client is not None:
+            await client.aclose()
+            client.close()
+
 # Create an MCP server
-mcp = FastMCP("mcp-zoho-inventory")
+mcp = FastMCP("mcp-zoho-inventory", lifespan=_lifespan)
+
+def _coalesce(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Let concurrent calls with the same arguments share one in-flight call
+    
+    Callers that arrive while an identical call is still running await its
+    result instead of sending their own request to the Zoho API.
+    
+    Args:
+        fn: Async handler to wrap
+        
+    Returns:
+        The wrapped handler
+    """
+    in_flight: Dict[Hashable, "asyncio.Future[T]"] = {}
+    
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        future = in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args, **kwargs))
+            in_flight[key] = future
+            future.add_done_callback(lambda _: in_flight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the call for the others
+        return await asyncio.shield(future)
+    
+    return wrapper
+
+def _dumps(obj: Any) -> str:
+    """
+    Serialize a handler result ourselves, so FastMCP doesn't re-serialize it
+    
+    Args:
+        obj: Handler result
+        
+    Returns:
+        The result as JSON text, indented only if ZOHO_MCP_PRETTY is set
+    """
+    return json_utils.dumps(obj, pretty=PRETTY_OUTPUT)
 
 @mcp.resource("inventory://stock/{item_name}")
-def get_stock_by_name(item_name: str) -> str:
+@_coalesce
+async def get_stock_by_name(item_name: str) -> str:
     """Get inventory details for a specific item by name"""
-    from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
-    
     try:
-        client = ZohoInventoryClient()
+        client = await asyncio.to_thread(_get_client)
         # URL decode the item name
         item_name = urllib.parse.unquote(item_name)
-        item = client.get_item_by_name(item_name)
+        item = await client.get_item_by_name_async(item_name)
         
         if not item:
-            return {"error": f"Item not found: {item_name}"}
-        return item
+            return _dumps({"error": f"Item not found: {item_name}"})
+        return _dumps(item)
     except Exception as e:
-        logger.error(f"Error getting item {item_name}: {str(e)}")
-        return {"error": str(e)}
+        logger.error("Error getting item %s: %s", item_name, e)
+        return _dumps({"error": str(e)})
 
-@mcp.resource("inventory://all") 
-def get_all_stock() -> str:
+@mcp.resource("inventory://all")
+@_coalesce
+async def get_all_stock() -> str:
     """Get all inventory items"""
-    from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
-    
     try:
-        client = ZohoInventoryClient()
-        items = client.get_all_items()
-        return items
+        client = await asyncio.to_thread(_get_client)
+        items = await client.get_all_items_async()
+        return _dumps(items)
     except Exception as e:
-        logger.error(f"Error getting all items: {str(e)}")
-        return {"error": str(e)}
+        logger.error("Error getting all items: %s", e)
+        return _dumps({"error": str(e)})
 
 @mcp.resource("inventory://sku/{sku_code}")
-def get_stock_by_sku(sku_code: str) -> str:
+@_coalesce
+async def get_stock_by_sku(sku_code: str) -> str:
     """Get inventory details for a specific item by SKU"""
-    from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
-    
     try:
-        client = ZohoInventoryClient()
+        client = await asyncio.to_thread(_get_client)
         # URL decode the SKU code
         sku_code = urllib.parse.unquote(sku_code)
-        item = client.get_item_by_sku(sku_code)
+        item = await client.get_item_by_sku_async(sku_code)
         
         if not item:
-            return {"error": f"Item not found with SKU: {sku_code}"}
-        return item
+            return _dumps({"error": f"Item not found with SKU: {sku_code}"})
+        return _dumps(item)
     except Exception as e:
-        logger.error(f"Error getting item with SKU {sku_code}: {str(e)}")
-        return {"error": str(e)}
+        logger.error("Error getting item with SKU %s: %s", sku_code, e)
+        return _dumps({"error": str(e)})
 
 @mcp.resource("inventory://warehouses")
-def get_all_warehouses() -> str:
+@_coalesce
+async def get_all_warehouses() -> str:
     """Get all warehouses"""
-    from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
-    
     try:
-        client = ZohoInventoryClient()
-        warehouses = client.get_all_warehouses()
-        return warehouses
+        client = await asyncio.to_thread(_get_client)
+        warehouses = await asyncio.to_thread(client.get_all_warehouses)
+        return _dumps(warehouses)
     except Exception as e:
-        logger.error(f"Error getting all warehouses: {str(e)}")
-        return {"error": str(e)}
+        logger.error("Error getting all warehouses: %s", e)
+        return _dumps({"error": str(e)})
 
 @mcp.tool()
-def update_stock_by_sku(sku: str, quantity: int, reason: str = "Stock update via API", warehouse_name: Optional[str] = None) -> str:
+async def update_stock_by_sku(sku: str, quantity: int, reason: str = "Stock update via API", warehouse_name: Optional[str] = None) -> str:
     """
     Update the stock quantity for an item by SKU
     
@@ -83,64 +175,121 @@ def update_stock_by_sku(sku: str, quantity: int, reason: str = "Stock update via
         reason: Reason for the stock update
         warehouse_name: Optional warehouse name for location-specific update
     """
-    from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
-    
     try:
-        client = ZohoInventoryClient()
-        logger.info(f"Updating stock for SKU: {sku} to quantity: {quantity} with warehouse_name: {warehouse_name}")
+        client = await asyncio.to_thread(_get_client)
+        logger.info("Updating stock for SKU: %s to quantity: %s with warehouse_name: %s", sku, quantity, warehouse_name)
         
-        # Get current item details to show in response
-        current_item = client.get_item_by_sku(sku)
-        if not current_item:
-            return {
-                "success": False,
-                "error": f"Item not found with SKU: {sku}"
-            }
-            
-        current_stock = current_item.get("available_stock", 0)
-        logger.info(f"Current stock for SKU {sku}: {current_stock}")
+        location_msg = f" in warehouse '{warehouse_name}'" if warehouse_name else ""
         
-        # Attempt to update stock
+        # Attempt to update stock; the item and the warehouse are looked up together
         try:
-            adjustment = client.override_stock_by_sku(sku, quantity, reason, warehouse_name)
-            
-            location_msg = f" in warehouse '{warehouse_name}'" if warehouse_name else ""
+            adjustment = await client.override_stock_by_sku_async(sku, quantity, reason, warehouse_name)
             
             # Check if this was a no-adjustment due to same quantities
             if isinstance(adjustment, dict) and "warning" in adjustment:
-                logger.info(f"No adjustment needed: {adjustment}")
-                return {
+                logger.info("No adjustment needed: %s", adjustment)
+                return _dumps({
                     "success": True,
                     "message": f"No change needed for SKU {sku}{location_msg}. Current stock already at {quantity}.",
                     "details": adjustment
-                }
+                })
                 
-            return {
+            return _dumps({
                 "success": True,
                 "message": f"Updated stock for SKU {sku} to {quantity}{location_msg}",
                 "adjustment": adjustment
-            }
+            })
             
         except Exception as adjustment_error:
             # Check for the specific error about zero adjustment
             error_str = str(adjustment_error)
             if "Adjustment quantity should not be zero" in error_str:
-                logger.info(f"Caught zero adjustment error, current stock already at target value")
-                return {
+                logger.info("Caught zero adjustment error, current stock already at target value")
+                return _dumps({
                     "success": True,
                     "message": f"Stock for SKU {sku} already at {quantity}{location_msg}. No adjustment needed.",
                     "note": "Current stock already matches requested quantity."
-                }
+                })
             else:
                 # Re-raise if it's not the zero adjustment error
                 raise
                 
     except Exception as e:
-        logger.error(f"Error updating inventory for SKU {sku}: {str(e)}")
-        return {
+        logger.error("Error updating inventory for SKU %s: %s", sku, e)
+        return _dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+@mcp.tool()
+async def update_stock_bulk(updates: List[Dict[str, Any]], reason: str = "Stock update via API") -> str:
+    """
+    Update the stock quantities for several items by SKU with a single inventory adjustment
+    
+    Args:
+        updates: Entries with "sku" and "quantity" (new quantity, not an adjustment),
+            and optionally "warehouse_name" for a location-specific update
+        reason: Reason for the stock updates
+    """
+    try:
+        client = await asyncio.to_thread(_get_client)
+        logger.info("Updating stock for %s SKUs", len(updates))
+        
+        # Resolve each distinct warehouse once; the lookups are served from the warehouse cache
+        warehouse_names = list({update["warehouse_name"] for update in updates if update.get("warehouse_name")})
+        location_ids = await asyncio.gather(
+            *(asyncio.to_thread(client.get_location_id_by_warehouse_name, name) for name in warehouse_names),
+            return_exceptions=True
+        )
+        locations = dict(zip(warehouse_names, location_ids))
+        
+        # Entries whose warehouse couldn't be resolved fail without being sent
+        results: List[Any] = [locations.get(update.get("warehouse_name")) for update in updates]
+        pending = [i for i, location in enumerate(results) if not isinstance(location, BaseException)]
+        adjustments = await client.override_stock_bulk([
+            {
+                "sku": updates[i]["sku"],
+                "target_quantity": updates[i]["quantity"],
+                "location_id": results[i]
+            }
+            for i in pending
+        ], reason)
+        for i, adjustment in zip(pending, adjustments):
+            results[i] = adjustment
+        
+        summary = []
+        for update, result in zip(updates, results):
+            entry = {"sku": update["sku"], "quantity": update["quantity"], "warehouse_name": update.get("warehouse_name")}
+            if isinstance(result, BaseException):
+                logger.error("Error updating inventory for SKU %s: %s", update["sku"], result)
+                entry.update(success=False, error=str(result))
+            else:
+                entry.update(success=True, adjustment=result)
+            summary.append(entry)
+        
+        return _dumps({
+            "success": all(entry["success"] for entry in summary),
+            "results": summary
+        })
+    except Exception as e:
+        logger.error("Error updating inventory in bulk: %s", e)
+        return _dumps({
             "success": False,
             "error": str(e)
-        }
+        })
+
+def _uvloop_available() -> bool:
+    """
+    Check whether uvloop (the "uvloop" extra) is installed
+    
+    Returns:
+        True if uvloop can be imported
+    """
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 def create_app():
     """Create a FastMCP app"""
@@ -150,12 +299,15 @@ def main():
     """Entry point for the MCP server"""
     try:
         logger.info("Starting MCP Zoho Inventory server")
-        # Use the direct run method without asyncio
-        mcp.run()
+        if _uvloop_available():
+            # Same as mcp.run() for stdio, but on the faster uvloop event loop
+            anyio.run(mcp.run_stdio_async, backend="asyncio", backend_options={"use_uvloop": True})
+        else:
+            mcp.run()
     except KeyboardInterrupt:
         logger.info("Server shutdown requested")
     except Exception as e:
-        logger.error(f"Error running server: {str(e)}")
+        logger.error("Error running server: %s", e)
         raise
 
 if __name__ == "__main__":
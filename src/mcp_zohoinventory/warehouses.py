@@ -1,34 +1,92 @@
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from .cache import TTLCache
 from .client import ZohoClient
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds that the warehouse list is reused; warehouses rarely change
+WAREHOUSE_CACHE_TTL = 300
+
 class WarehouseClient(ZohoClient):
     """Client for interacting with Zoho Inventory Warehouses API"""
     
+    def __init__(self, 
+                 refresh_token: Optional[str] = None,
+                 client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None,
+                 share_with: Optional[ZohoClient] = None):
+        """
+        Initialize the warehouse client
+        
+        Args:
+            refresh_token: Refresh token for getting new access tokens, if None will try to get from environment
+            client_id: Client ID for OAuth, if None will try to get from environment
+            client_secret: Client Secret for OAuth, if None will try to get from environment
+            share_with: Existing client whose authentication and connection pools are reused
+        """
+        super().__init__(refresh_token, client_id, client_secret, share_with)
+        
+        # Holds a single (warehouses, name index, ID index) entry for the cached warehouse list
+        self._list_cache = TTLCache(maxsize=1, ttl=WAREHOUSE_CACHE_TTL)
+    
+    def invalidate(self) -> None:
+        """Drop the cached warehouse list, e.g. after warehouses were changed"""
+        self._list_cache.clear()
+    
+    def _cached_list(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Get the warehouse list and its indexes, fetching them if the cache expired
+        
+        Returns:
+            Tuple of the warehouses, a warehouse_name -> warehouse dictionary and
+            a warehouse_id -> warehouse dictionary
+        """
+        cached = self._list_cache.get("warehouses")
+        if cached is None:
+            warehouses = self._fetch_list()
+            # Built from the end so the first warehouse wins if two share a name, as the old scan did
+            reversed_warehouses = warehouses[::-1]
+            cached = (
+                warehouses,
+                {w.get("warehouse_name"): w for w in reversed_warehouses},
+                {w.get("warehouse_id"): w for w in reversed_warehouses}
+            )
+            self._list_cache.set("warehouses", cached)
+        return cached
+    
     def list(self) -> List[Dict[str, Any]]:
         """
         Get all warehouses
         
+        Returns:
+            List of all warehouses
+        """
+        # Copy so callers can't modify the cached list
+        return list(self._cached_list()[0])
+    
+    def _fetch_list(self) -> List[Dict[str, Any]]:
+        """
+        Fetch all warehouses from the API
+        
         Returns:
             List of all warehouses
         """
         # Log the operation
         logger.info("Getting all warehouses")
         
-        response = self.make_api_request("GET", "warehouses")
-        data = response.json()
+        data = self.get_json_conditional("warehouses")
         
         # Log response preview
-        preview = {k: v for k, v in data.items() if k != 'warehouses'}
-        if 'warehouses' in data:
-            preview['warehouses_count'] = len(data['warehouses'])
-            if data['warehouses']:
-                preview['first_warehouse_preview'] = data['warehouses'][0]['warehouse_name'] if 'warehouse_name' in data['warehouses'][0] else '(no name)'
-        
-        logger.info(f"API response summary for list: {preview}")
+        if logger.isEnabledFor(logging.INFO):
+            preview = {k: v for k, v in data.items() if k != 'warehouses'}
+            if 'warehouses' in data:
+                preview['warehouses_count'] = len(data['warehouses'])
+                if data['warehouses']:
+                    preview['first_warehouse_preview'] = data['warehouses'][0]['warehouse_name'] if 'warehouse_name' in data['warehouses'][0] else '(no name)'
+            
+            logger.info("API response summary for list: %s", preview)
         
         return data.get("warehouses", [])
         
@@ -42,16 +100,21 @@ class WarehouseClient(ZohoClient):
         Returns:
             Warehouse details as dictionary
         """
+        # Use the cached warehouse list if it is fresh and has this warehouse
+        cached = self._list_cache.get("warehouses")
+        if cached is not None and warehouse_id in cached[2]:
+            return cached[2][warehouse_id]
+        
         # Log the operation
-        logger.info(f"Getting warehouse by ID: {warehouse_id}")
+        logger.info("Getting warehouse by ID: %s", warehouse_id)
         
         response = self.make_api_request(
             "GET",
             f"warehouses/{warehouse_id}"
         )
         
-        data = response.json()
-        logger.info(f"API response for get_warehouse_by_id: {data}")
+        data = self._json(response)
+        logger.debug("API response for get_warehouse_by_id: %s", data)
         
         return data.get("warehouse", {})
         
@@ -66,23 +129,20 @@ class WarehouseClient(ZohoClient):
             Warehouse details as dictionary
         """
         # Log the operation
-        logger.info(f"Getting warehouse by name: {name}")
-        
-        # Get all warehouses and filter by name
-        warehouses = self.list()
+        logger.info("Getting warehouse by name: %s", name)
         
-        logger.info(f"Found {len(warehouses)} warehouses total, searching for name: '{name}'")
+        # Look the name up in the index of the (cached) warehouse list
+        warehouses, by_name, _ = self._cached_list()
         
         # Log all warehouse names for debugging
-        warehouse_names = [w.get("warehouse_name", "(unnamed)") for w in warehouses]
-        logger.info(f"Available warehouse names: {warehouse_names}")
+        if logger.isEnabledFor(logging.DEBUG):
+            warehouse_names = [w.get("warehouse_name", "(unnamed)") for w in warehouses]
+            logger.debug("Searching %s warehouses for name '%s': %s", len(warehouses), name, warehouse_names)
         
-        for warehouse in warehouses:
-            warehouse_name = warehouse.get("warehouse_name", "(unnamed)")
-            logger.info(f"Comparing warehouse name '{warehouse_name}' against requested name '{name}'")
-            if warehouse_name == name:
-                logger.info(f"Found matching warehouse with ID: {warehouse.get('warehouse_id')}")
-                return warehouse
+        warehouse = by_name.get(name)
+        if warehouse is not None:
+            logger.info("Found matching warehouse with ID: %s", warehouse.get('warehouse_id'))
+            return warehouse
         
-        logger.warning(f"No warehouse found with name: '{name}'")
+        logger.warning("No warehouse found with name: '%s'", name)
         return {} 
\ No newline at end of file
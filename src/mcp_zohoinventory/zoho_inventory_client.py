@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import httpx
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 
 from .items import ItemClient
@@ -26,12 +28,28 @@ class ZohoInventoryClient:
             client_id: Client ID for OAuth, if None will try to get from environment
             client_secret: Client Secret for OAuth, if None will try to get from environment
         """
-        # Initialize domain-specific clients
+        # Initialize domain-specific clients; they share one token and one connection pool
         self._item_client = ItemClient(refresh_token, client_id, client_secret)
-        self._warehouse_client = WarehouseClient(refresh_token, client_id, client_secret)
+        self._warehouse_client = WarehouseClient(share_with=self._item_client)
         
         logger.info("ZohoInventoryClient initialized with all domain-specific clients")
     
+    def close(self) -> None:
+        """Close the pooled HTTP connections of all domain-specific clients"""
+        self._item_client.close()
+        self._warehouse_client.close()
+    
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP connections of all domain-specific clients"""
+        await self._item_client.aclose()
+        await self._warehouse_client.aclose()
+    
+    def __enter__(self) -> "ZohoInventoryClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     # Item-related methods
     
     def get_item_by_name(self, name: str) -> Dict[str, Any]:
@@ -80,29 +98,125 @@ class ZohoInventoryClient:
         """
         return self._item_client.update_item_stock(name, stock_on_hand)
     
-    def adjust_inventory_by_sku(self, sku: str, quantity: int, reason: str = "Stock update via API") -> Dict[str, Any]:
+    async def get_item_by_name_async(self, name: str) -> Dict[str, Any]:
         """
-        Adjust inventory quantity for an item by SKU using inventoryadjustments API
+        Get inventory item details by name without blocking the event loop
+        
+        Args:
+            name: Name of the inventory item
+            
+        Returns:
+            Item details as dictionary
+        """
+        return await self._item_client.get_item_by_name_async(name)
+    
+    async def get_item_by_sku_async(self, sku: str) -> Dict[str, Any]:
+        """
+        Get inventory item details by SKU without blocking the event loop
         
         Args:
             sku: SKU of the inventory item
-            quantity: Quantity to adjust (positive or negative)
-            reason: Reason for the adjustment
             
         Returns:
-            Adjustment details or error message
+            Item details as dictionary
+        """
+        return await self._item_client.get_item_by_sku_async(sku)
+    
+    async def get_all_items_async(self) -> List[Dict[str, Any]]:
+        """
+        Get all inventory items without blocking the event loop
+        
+        Returns:
+            List of all inventory items
+        """
+        return await self._item_client.list_async()
+    
+    async def update_item_stock_async(self, name: str, stock_on_hand: int) -> Dict[str, Any]:
+        """
+        Update the stock level for an item by name without blocking the event loop
+        
+        Args:
+            name: Name of the inventory item
+            stock_on_hand: New stock level
+            
+        Returns:
+            Updated item details
+        """
+        return await self._item_client.update_item_stock_async(name, stock_on_hand)
+    
+    def invalidate_sku(self, sku: str) -> None:
+        """
+        Forget everything cached for a SKU, e.g. after the API rejected a change for it
+        
+        Args:
+            sku: SKU of the inventory item
+        """
+        self._item_client.invalidate_sku(sku)
+    
+    def _item_id_of(self, sku: str, item: Dict[str, Any]) -> str:
+        """
+        Get the item ID from the lookup result for a SKU, logging why it is missing
+        
+        Args:
+            sku: SKU of the inventory item
+            item: Item details as returned by the SKU lookup, or {} if not found
+            
+        Returns:
+            ID of the inventory item
         """
-        # First get the item to find its ID
-        item = self.get_item_by_sku(sku)
         if not item:
+            logger.error("Item not found with SKU: %s", sku)
             raise ValueError(f"Item not found with SKU: {sku}")
         
         item_id = item.get("item_id")
         if not item_id:
+            logger.error("Item ID not found for SKU: %s", sku)
             raise ValueError(f"Item ID not found for SKU: {sku}")
+        
+        return item_id
+    
+    def _resolve_item_id(self, sku: str, current_item: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the item ID for a SKU, from the caller's item or the (cached) SKU lookup
+        
+        Args:
+            sku: SKU of the inventory item
+            current_item: Item details the caller already fetched for this SKU
+            
+        Returns:
+            ID of the inventory item
+        """
+        if current_item and current_item.get("item_id"):
+            return current_item["item_id"]
+        return self._item_id_of(sku, self.get_item_by_sku(sku))
+    
+    def adjust_inventory_by_sku(self, sku: str, quantity: int, reason: str = "Stock update via API", warehouse_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Adjust inventory quantity for an item by SKU using inventoryadjustments API
+        
+        Args:
+            sku: SKU of the inventory item
+            quantity: Quantity to adjust (positive or negative)
+            reason: Reason for the adjustment
+            warehouse_name: Optional name of the warehouse for location-specific update
+            
+        Returns:
+            Adjustment details or error message
+        """
+        # First get the item to find its ID
+        item_id = self._resolve_item_id(sku)
+        
+        # If warehouse name is provided, get the location ID
+        location_id = self._resolve_location_id(warehouse_name) if warehouse_name else None
             
         # Adjust the inventory
-        return self._item_client.adjust_inventory_by_item_id(item_id, quantity, reason)
+        try:
+            return self._item_client.adjust_inventory_by_item_id(item_id, quantity, reason, location_id)
+        except httpx.HTTPStatusError as e:
+            # A rejected change may mean the cached item ID is stale
+            if e.response.status_code < 500:
+                self.invalidate_sku(sku)
+            raise
     
     def get_location_id_by_warehouse_name(self, warehouse_name: str) -> str:
         """
@@ -124,7 +238,26 @@ class ZohoInventoryClient:
         
         return warehouse_id
     
-    def override_stock_by_sku(self, sku: str, target_quantity: int, reason: str = "Stock override via API", warehouse_name: Optional[str] = None) -> Dict[str, Any]:
+    def _resolve_location_id(self, warehouse_name: str) -> str:
+        """
+        Get the location ID for a warehouse name, logging the outcome
+        
+        Args:
+            warehouse_name: Name of the warehouse
+            
+        Returns:
+            Location ID of the warehouse
+        """
+        logger.info("Attempting to get location_id for warehouse named: %s", warehouse_name)
+        try:
+            location_id = self.get_location_id_by_warehouse_name(warehouse_name)
+        except Exception as e:
+            logger.error("Error getting location_id for warehouse %s: %s", warehouse_name, e)
+            raise
+        logger.info("Successfully resolved warehouse_name '%s' to location_id '%s'", warehouse_name, location_id)
+        return location_id
+    
+    def override_stock_by_sku(self, sku: str, target_quantity: int, reason: str = "Stock override via API", warehouse_name: Optional[str] = None, current_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Override inventory quantity for an item by SKU to an exact value
         
@@ -133,46 +266,156 @@ class ZohoInventoryClient:
             target_quantity: Exact quantity to set
             reason: Reason for the override
             warehouse_name: Optional name of the warehouse for location-specific update
+            current_item: Item details the caller already fetched for this SKU, which skips the lookup
             
         Returns:
             Adjustment details or error message
         """
         # First get the item to find its ID
-        logger.info(f"Starting override_stock_by_sku for SKU: {sku}, target_quantity: {target_quantity}, warehouse_name: {warehouse_name}")
+        logger.info("Starting override_stock_by_sku for SKU: %s, target_quantity: %s, warehouse_name: %s", sku, target_quantity, warehouse_name)
         
-        item = self.get_item_by_sku(sku)
-        if not item:
-            logger.error(f"Item not found with SKU: {sku}")
-            raise ValueError(f"Item not found with SKU: {sku}")
+        item_id = self._resolve_item_id(sku, current_item)
         
-        item_id = item.get("item_id")
-        if not item_id:
-            logger.error(f"Item ID not found for SKU: {sku}")
-            raise ValueError(f"Item ID not found for SKU: {sku}")
-        
-        logger.info(f"Found item with ID: {item_id} for SKU: {sku}")
+        logger.info("Found item with ID: %s for SKU: %s", item_id, sku)
         
         # If warehouse name is provided, get the location ID
-        location_id = None
-        if warehouse_name:
-            logger.info(f"Attempting to get location_id for warehouse named: {warehouse_name}")
-            try:
-                warehouse = self.get_warehouse_by_name(warehouse_name)
-                logger.info(f"Warehouse found: {warehouse}")
-                
-                location_id = warehouse.get("warehouse_id")
-                if not location_id:
-                    logger.error(f"Warehouse found but warehouse_id is missing for name: {warehouse_name}")
-                    raise ValueError(f"Warehouse ID not found for name: {warehouse_name}")
-                    
-                logger.info(f"Successfully resolved warehouse_name '{warehouse_name}' to location_id '{location_id}'")
-            except Exception as e:
-                logger.error(f"Error getting location_id for warehouse {warehouse_name}: {str(e)}")
-                raise
+        location_id = self._resolve_location_id(warehouse_name) if warehouse_name else None
             
         # Override the inventory
-        logger.info(f"Calling override_item_stock_by_id with item_id: {item_id}, target_quantity: {target_quantity}, location_id: {location_id}")
-        return self._item_client.override_item_stock_by_id(item_id, target_quantity, reason, location_id)
+        logger.info("Calling override_item_stock_by_id with item_id: %s, target_quantity: %s, location_id: %s", item_id, target_quantity, location_id)
+        try:
+            return self._item_client.override_item_stock_by_id(item_id, target_quantity, reason, location_id)
+        except httpx.HTTPStatusError as e:
+            # A rejected change may mean the cached item ID is stale
+            if e.response.status_code < 500:
+                self.invalidate_sku(sku)
+            raise
+    
+    async def _resolve_item_id_async(self, sku: str, current_item: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the item ID for a SKU like _resolve_item_id, without blocking the event loop
+        
+        Args:
+            sku: SKU of the inventory item
+            current_item: Item details the caller already fetched for this SKU
+            
+        Returns:
+            ID of the inventory item
+        """
+        if current_item and current_item.get("item_id"):
+            return current_item["item_id"]
+        return self._item_id_of(sku, await self.get_item_by_sku_async(sku))
+    
+    async def override_stock_by_sku_async(self, sku: str, target_quantity: int, reason: str = "Stock override via API", warehouse_name: Optional[str] = None, current_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Override inventory quantity for an item by SKU to an exact value without blocking the event loop
+        
+        The item and the warehouse are looked up at the same time.
+        
+        Args:
+            sku: SKU of the inventory item
+            target_quantity: Exact quantity to set
+            reason: Reason for the override
+            warehouse_name: Optional name of the warehouse for location-specific update
+            current_item: Item details the caller already fetched for this SKU, which skips the lookup
+            
+        Returns:
+            Adjustment details or error message
+        """
+        logger.info("Starting override_stock_by_sku_async for SKU: %s, target_quantity: %s, warehouse_name: %s", sku, target_quantity, warehouse_name)
+        
+        item_lookup = self._resolve_item_id_async(sku, current_item)
+        if warehouse_name:
+            # The warehouse lookup is synchronous (and cached), so it runs on a worker thread
+            item_id, location_id = await asyncio.gather(
+                item_lookup,
+                asyncio.to_thread(self._resolve_location_id, warehouse_name)
+            )
+        else:
+            item_id, location_id = await item_lookup, None
+        
+        logger.info("Found item with ID: %s for SKU: %s", item_id, sku)
+        
+        try:
+            return await self._item_client.override_item_stock_by_id_async(item_id, target_quantity, reason, location_id)
+        except httpx.HTTPStatusError as e:
+            # A rejected change may mean the cached item ID is stale
+            if e.response.status_code < 500:
+                self.invalidate_sku(sku)
+            raise
+    
+    async def override_stock_bulk(self, entries: List[Dict[str, Any]], reason: str = "Stock override via API") -> List[Any]:
+        """
+        Override inventory quantities for several SKUs with a single inventory adjustment
+        
+        Each distinct SKU is resolved to its item ID once, all at the same
+        time; every difference from the current stock is then sent as a line
+        item of one inventoryadjustments request.
+        
+        Args:
+            entries: Dictionaries with "sku" and "target_quantity", and optionally "location_id";
+                each SKU may appear once per location
+            reason: Reason for the adjustment
+            
+        Returns:
+            Result per entry, in the order of entries: the adjustment details, a warning
+            dictionary if the stock already matched, or the exception that made the entry
+            fail; if Zoho rejects the combined adjustment, the entries are retried one by
+            one so only the offending ones fail
+        """
+        # A SKU listed for several warehouses is looked up only once
+        skus = list(dict.fromkeys(entry["sku"] for entry in entries))
+        resolved = await asyncio.gather(
+            *(self._resolve_item_id_async(sku) for sku in skus),
+            return_exceptions=True
+        )
+        item_ids_by_sku = dict(zip(skus, resolved))
+        
+        results: List[Any] = [None] * len(entries)
+        targets = []
+        target_indexes: Dict[Tuple[str, Optional[str]], int] = {}
+        for i, entry in enumerate(entries):
+            item_id = item_ids_by_sku[entry["sku"]]
+            key = (item_id, entry.get("location_id"))
+            if isinstance(item_id, BaseException):
+                results[i] = item_id
+            elif key in target_indexes:
+                # Both line items would be computed from the same current stock
+                results[i] = ValueError(f"Duplicate entry for SKU {entry['sku']} at the same location")
+            else:
+                target_indexes[key] = i
+                targets.append((item_id, entry["target_quantity"], entry.get("location_id")))
+        
+        if not targets:
+            return results
+        
+        outcomes = await self._item_client.override_item_stock_bulk_async(targets, reason)
+        for i, outcome in zip(target_indexes.values(), outcomes):
+            # A rejected change may mean the cached item ID is stale
+            if isinstance(outcome, httpx.HTTPStatusError) and outcome.response.status_code < 500:
+                self.invalidate_sku(entries[i]["sku"])
+            results[i] = outcome
+        return results
+    
+    def override_stock_bulk_sync(self, entries: List[Dict[str, Any]], reason: str = "Stock override via API") -> List[Any]:
+        """
+        Override inventory quantities for several SKUs with a single inventory adjustment, from synchronous code
+        
+        Args:
+            entries: See override_stock_bulk
+            reason: Reason for the adjustment
+            
+        Returns:
+            See override_stock_bulk
+        """
+        async def run() -> List[Any]:
+            try:
+                return await self.override_stock_bulk(entries, reason)
+            finally:
+                # The async connections belong to the loop that asyncio.run is about to close
+                await self.aclose()
+        
+        return asyncio.run(run())
     
     # Warehouse-related methods
     
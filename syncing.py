@@ -1,16 +1,40 @@
 import asyncio
 import json
 import os
-import requests
-from typing import Dict, Any, List, Tuple
-from collections import defaultdict
+import httpx
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib parser
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Command used to spawn the MCP server over stdio
+SERVER_PARAMS = StdioServerParameters(command="uv", args=["run", "mcp-zoho"])
+
+# Maximum number of update_stock_bulk calls in flight at once
+SYNC_CONCURRENCY = int(os.environ.get('SYNC_CONCURRENCY', '8'))
+
+# Number of SKU/warehouse updates sent per update_stock_bulk call
+SYNC_BATCH_SIZE = 100
+
+# Retries for transient errors from the inventory API, with exponential backoff
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.3
+FETCH_RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# Shared HTTP client for the inventory API, created on first use
+_SESSION: Optional[httpx.AsyncClient] = None
+
 # Warehouse name mapping
 WAREHOUSE_MAPPING = {
     'STOCK IN WAREHOUSE - ES': 'Spain Warehouse',
@@ -19,6 +43,12 @@ WAREHOUSE_MAPPING = {
     'STOCK IN WAREHOUSE - UK - PRIM': 'Primary Office Furniture Services'
 }
 
+def _loads(text: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 def get_api_config() -> Tuple[str, str]:
     """
     Get API configuration from environment variables
@@ -34,24 +64,61 @@ def get_api_config() -> Tuple[str, str]:
     
     return base_url, sheet_id
 
-def fetch_inventory_data(base_url: str, sheet_id: str) -> List[Dict[str, Any]]:
+@dataclass(slots=True)
+class UpdateResult:
+    """Outcome of the stock update for one SKU in one warehouse"""
+    sku: str
+    warehouse: str
+    quantity: int
+    ok: bool
+    error: Optional[str] = None
+
+def get_session() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the inventory API, creating it on first use
+    
+    Returns:
+        AsyncClient whose keep-alive connections are reused across requests
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # The transport retries failed connection attempts; status retries are in fetch_inventory_data
+            transport=httpx.AsyncHTTPTransport(
+                retries=FETCH_RETRIES,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=4)
+            )
+        )
+    return _SESSION
+
+async def close_session() -> None:
+    """Close the shared HTTP client, if it was created"""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.aclose()
+        _SESSION = None
+
+async def fetch_inventory_data(url: str) -> List[Dict[str, Any]]:
     """
     Fetch inventory data from the API
     
     Args:
-        base_url: The base URL of the API
-        sheet_id: The sheet ID to fetch
+        url: URL of the inventory sheet
         
     Returns:
         List of inventory items
     """
-    url = f"{base_url}/api/sheets?sheet_id={sheet_id}"
-    
     try:
-        response = requests.get(url)
+        session = get_session()
+        for attempt in range(FETCH_RETRIES + 1):
+            response = await session.get(url)
+            if response.status_code not in FETCH_RETRY_STATUS_CODES or attempt == FETCH_RETRIES:
+                break
+            await asyncio.sleep(FETCH_BACKOFF * (2 ** attempt))
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return _loads(response.content)
+    except httpx.HTTPError as e:
         raise RuntimeError(f"Failed to fetch inventory data: {str(e)}")
 
 def translate_warehouse_name(api_warehouse: str) -> str:
@@ -66,17 +133,39 @@ def translate_warehouse_name(api_warehouse: str) -> str:
     """
     return WAREHOUSE_MAPPING.get(api_warehouse, api_warehouse)
 
-def process_inventory_data(items: List[Dict[str, Any]]) -> Dict[Tuple[str, str], int]:
+def _to_int(value: Any) -> Optional[int]:
+    """
+    Convert a spreadsheet cell to an int, treating empty cells as 0
+    
+    Args:
+        value: Cell value from the API
+        
+    Returns:
+        The integer value, or None if the cell is not a valid number
+    """
+    if type(value) is int:
+        return value
+    try:
+        return int(value or 0)
+    except (ValueError, TypeError):
+        return None
+
+def process_inventory_data(items: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
     """
     Process inventory data to calculate quantities by SKU and warehouse
     
+    The items are read in a single pass, so any iterable of rows works.
+    
     Args:
-        items: List of inventory items
+        items: Inventory items
         
     Returns:
-        Dictionary with (sku, warehouse) tuples as keys and quantities as values
+        Dictionary mapping each SKU to a dictionary of quantities by warehouse
     """
-    stock_by_sku_and_warehouse = defaultdict(int)
+    stock_by_sku_and_warehouse: Dict[str, Dict[str, int]] = {}
+    
+    # Translated warehouse names, looked up here so repeated rows skip the function call
+    warehouse_names: Dict[str, str] = {}
     
     for item in items:
         # Skip items without SKU
@@ -84,144 +173,246 @@ def process_inventory_data(items: List[Dict[str, Any]]) -> Dict[Tuple[str, str],
         if not sku or not sku.strip():
             continue
             
+        # Get quantity values, skipping the row if either is not a valid number
+        qty = _to_int(item.get('QTY'))
+        adj = _to_int(item.get('ADJ'))
+        if qty is None or adj is None:
+            continue
+        total_qty = qty + adj
+        
         # Get warehouse and translate it
         api_warehouse = item.get('CURRENT LOCATION', '')
-        warehouse = translate_warehouse_name(api_warehouse)
-        
-        # Get quantity values
-        try:
-            qty = int(item.get('QTY', 0) or 0)
-            adj = int(item.get('ADJ', 0) or 0)
-            total_qty = qty + adj
-        except (ValueError, TypeError):
-            # Skip if quantity is not a valid number
-            continue
-            
+        warehouse = warehouse_names.get(api_warehouse)
+        if warehouse is None:
+            warehouse = warehouse_names[api_warehouse] = translate_warehouse_name(api_warehouse)
+        
         # Add to our grouped data
-        stock_by_sku_and_warehouse[(sku, warehouse)] += total_qty
+        stock_by_warehouse = stock_by_sku_and_warehouse.get(sku)
+        if stock_by_warehouse is None:
+            stock_by_warehouse = stock_by_sku_and_warehouse[sku] = {}
+        stock_by_warehouse[warehouse] = stock_by_warehouse.get(warehouse, 0) + total_qty
     
     return stock_by_sku_and_warehouse
 
-async def call_update_stock_tool(
+def iter_stock_updates(stock_data: Dict[str, Dict[str, int]]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Flatten processed inventory data into individual stock updates
+    
+    Args:
+        stock_data: Dictionary mapping each SKU to a dictionary of quantities by warehouse
+        
+    Returns:
+        Iterator over (sku, warehouse, quantity) tuples
+    """
+    for sku, stock_by_warehouse in stock_data.items():
+        for warehouse, quantity in stock_by_warehouse.items():
+            yield sku, warehouse, quantity
+
+async def call_update_stock_bulk_tool(
     session: ClientSession,
-    sku: str,
-    quantity: int,
-    reason: str = "Stock update via API",
-    warehouse_name: str = None
-) -> Dict[str, Any]:
+    updates: List[Dict[str, Any]],
+    reason: str = "Stock update via API"
+) -> List[Dict[str, Any]]:
     """
-    Call the update_stock_by_sku tool on the MCP server
+    Call the update_stock_bulk tool on the MCP server
     
     Args:
         session: The client session to use
-        sku: SKU of the item to update
-        quantity: New quantity to set
-        reason: Reason for the stock update
-        warehouse_name: Optional warehouse name for location-specific update
+        updates: Entries with "sku", "quantity" and optionally "warehouse_name"
+        reason: Reason for the stock updates
         
     Returns:
-        The parsed JSON response from the tool
+        The parsed JSON result for each entry, in the order of updates
     """
     try:
-        # Prepare parameters for the tool call
-        params = {
-            "sku": sku,
-            "quantity": quantity,
-            "reason": reason
-        }
-        
-        # Add warehouse_name only if it's provided
-        if warehouse_name:
-            params["warehouse_name"] = warehouse_name
-            
-        # Call the tool and get the response
-        response = await session.call_tool("update_stock_by_sku", params)
-        
-        # Parse and return the response
-        if response and hasattr(response, 'contents') and response.contents:
-            result = json.loads(response.contents[0].text)
-            return result
-        else:
-            return {"error": "No response from tool call"}
-            
+        response = await session.call_tool("update_stock_bulk", {"updates": updates, "reason": reason})
+        result = parse_tool_response(response)
     except Exception as e:
-        return {"error": f"Failed to call update_stock_by_sku tool: {str(e)}"}
+        result = {"error": f"Failed to call update_stock_bulk tool: {str(e)}"}
+    
+    results = result.get("results")
+    if not isinstance(results, list):
+        # If the call as a whole failed, every entry in it failed
+        error = result if "error" in result else {"error": "update_stock_bulk returned no per-entry results"}
+        return [error] * len(updates)
+    
+    if len(results) != len(updates):
+        print(f"Warning: update_stock_bulk returned {len(results)} results for {len(updates)} updates")
+    
+    # Results are in the order of updates; an update without its result is reported as failed
+    matched = []
+    for i, update in enumerate(updates):
+        entry = results[i] if i < len(results) else None
+        if not isinstance(entry, dict) or entry.get("sku") != update["sku"]:
+            entry = {"error": f"No result returned for SKU {update['sku']}"}
+        matched.append(entry)
+    return matched
 
-async def update_all_stock(session: ClientSession, stock_data: Dict[Tuple[str, str], int]) -> List[Dict[str, Any]]:
+def parse_tool_response(response: Any) -> Dict[str, Any]:
     """
-    Update stock for all SKUs and warehouses
+    Parse the JSON text returned by an MCP tool
+    
+    Args:
+        response: The CallToolResult from session.call_tool
+        
+    Returns:
+        The parsed JSON response, or an error dictionary if the tool returned nothing
+    """
+    if response and response.content:
+        return _loads(response.content[0].text)
+    return {"error": "No response from tool call"}
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split an iterable into lists of at most size elements
+    
+    Args:
+        iterable: Elements to split
+        size: Maximum number of elements per list
+        
+    Returns:
+        Iterator over the lists, in order
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+async def update_all_stock(session: ClientSession, stock_data: Dict[str, Dict[str, int]]) -> List[UpdateResult]:
+    """
+    Update stock for all SKUs and warehouses concurrently
+    
+    Updates are sent SYNC_BATCH_SIZE at a time through the update_stock_bulk
+    tool, with at most SYNC_CONCURRENCY batches in flight at the same time.
     
     Args:
         session: The client session to use
-        stock_data: Dictionary with (sku, warehouse) tuples as keys and quantities as values
+        stock_data: Dictionary mapping each SKU to a dictionary of quantities by warehouse
         
     Returns:
-        List of results from stock updates
+        List of results from stock updates, in the order of stock_data
     """
-    results = []
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
     
-    for (sku, warehouse), quantity in stock_data.items():
-        print(f"Updating stock for SKU {sku} to {quantity} units in {warehouse}")
+    async def update_batch(batch: List[Tuple[str, str, int]]) -> List[UpdateResult]:
+        updates = [
+            {"sku": sku, "quantity": quantity, "warehouse_name": warehouse}
+            for sku, warehouse, quantity in batch
+        ]
+        async with semaphore:
+            batch_results = await call_update_stock_bulk_tool(
+                session=session,
+                updates=updates,
+                reason="Inventory sync from spreadsheet"
+            )
         
-        result = await call_update_stock_tool(
-            session=session,
-            sku=sku,
-            quantity=quantity,
-            reason="Inventory sync from spreadsheet",
-            warehouse_name=warehouse
-        )
+        results = []
+        for (sku, warehouse, quantity), result in zip(batch, batch_results):
+            ok = bool(result.get("success", False))
+            error = None if ok else result.get("error", "Unknown error")
+            results.append(UpdateResult(sku, warehouse, quantity, ok, error))
+        return results
+    
+    update_count = sum(map(len, stock_data.values()))
+    print(f"Updating stock for {update_count} SKU/warehouse combinations in batches of {SYNC_BATCH_SIZE}")
+    
+    # call_update_stock_bulk_tool reports failures in its results, so one bad batch doesn't cancel the rest
+    batch_results = await asyncio.gather(
+        *(update_batch(batch) for batch in batched(iter_stock_updates(stock_data), SYNC_BATCH_SIZE))
+    )
+    return [result for batch in batch_results for result in batch]
+
+async def load_stock_data(url: str) -> Dict[str, Dict[str, int]]:
+    """
+    Fetch inventory data and aggregate it by SKU and warehouse
+    
+    The aggregation runs on a worker thread so the event loop stays free
+    for the MCP server start-up it overlaps with.
+    
+    Args:
+        url: URL of the inventory sheet
         
-        results.append({
-            "sku": sku,
-            "warehouse": warehouse,
-            "quantity": quantity,
-            "result": result
-        })
+    Returns:
+        Dictionary mapping each SKU to a dictionary of quantities by warehouse
+    """
+    items = await fetch_inventory_data(url)
+    print(f"Retrieved {len(items)} items from API")
+    
+    stock_data = await asyncio.to_thread(process_inventory_data, items)
+    print(f"Processed data into {sum(map(len, stock_data.values()))} unique SKU/warehouse combinations")
+    return stock_data
+
+async def open_mcp_session(stack: AsyncExitStack) -> ClientSession:
+    """
+    Start the MCP server and initialize a session with it
+    
+    The contexts are entered on the calling task, because the stdio
+    transport must be closed by the task that opened it.
     
-    return results
+    Args:
+        stack: Exit stack that closes the session and stops the server when it exits
+        
+    Returns:
+        The initialized client session
+    """
+    read, write = await stack.enter_async_context(stdio_client(SERVER_PARAMS))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
 
 async def main():
     """Main function to orchestrate the inventory sync process"""
     try:
         # Get API configuration
         base_url, sheet_id = get_api_config()
-        print(f"Fetching inventory data from {base_url}/api/sheets?sheet_id={sheet_id}")
-        
-        # Fetch and process inventory data
-        items = fetch_inventory_data(base_url, sheet_id)
-        print(f"Retrieved {len(items)} items from API")
-        
-        stock_data = process_inventory_data(items)
-        print(f"Processed data into {len(stock_data)} unique SKU/warehouse combinations")
-        
-        # Connect to the MCP server and update stock
-        async with stdio_client(
-            StdioServerParameters(command="uv", args=["run", "mcp-zoho"])
-        ) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize the session
-                await session.initialize()
-                
-                # Update all stock
-                results = await update_all_stock(session, stock_data)
-                
-                # Print summary
-                success_count = sum(1 for r in results if r["result"].get("success", False))
-                print(f"\nUpdate Summary: {success_count}/{len(results)} successful updates")
-                
-                # Print details
-                print("\nDetail of updates:")
-                for result in results:
-                    status = "✅ Success" if result["result"].get("success", False) else "❌ Failed"
-                    print(f"{status} - SKU: {result['sku']} in {result['warehouse']} -> {result['quantity']} units")
-                    
-                    # Print error if present
-                    if not result["result"].get("success", False):
-                        error = result["result"].get("error", "Unknown error")
-                        print(f"  Error: {error}")
+        url = f"{base_url}/api/sheets?sheet_id={sheet_id}"
+        print(f"Fetching inventory data from {url}")
+        
+        async with AsyncExitStack() as stack:
+            stack.push_async_callback(close_session)
+            
+            # Fetch and process inventory data while the MCP server starts up
+            load_task = asyncio.create_task(load_stock_data(url))
+            # Don't leave the fetch running if the MCP server failed to start
+            stack.callback(load_task.cancel)
+            session = await open_mcp_session(stack)
+            stock_data = await load_task
+            
+            # Update all stock
+            results = await update_all_stock(session, stock_data)
+            
+            # Print summary
+            success_count = sum(r.ok for r in results)
+            print(f"\nUpdate Summary: {success_count}/{len(results)} successful updates")
+            
+            # Print details, collected into a single write
+            lines = ["\nDetail of updates:"]
+            for result in results:
+                status = "✅ Success" if result.ok else "❌ Failed"
+                lines.append(f"{status} - SKU: {result.sku} in {result.warehouse} -> {result.quantity} units")
                 
+                # Add error if present
+                if not result.ok:
+                    lines.append(f"  Error: {result.error}")
+            print("\n".join(lines))
+            
     except Exception as e:
         print(f"Error in inventory sync process: {str(e)}")
 
+def run(coro: Any) -> Any:
+    """
+    Run a coroutine on uvloop when it is installed, otherwise on the default event loop
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional (the "uvloop" extra) and unavailable on Windows
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main()) 
\ No newline at end of file
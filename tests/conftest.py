@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from mcp_zohoinventory import auth
+from mcp_zohoinventory.client import ZohoClient
+from mcp_zohoinventory.items import ItemClient
+from mcp_zohoinventory.zoho_inventory_client import ZohoInventoryClient
+
+@pytest.fixture
+def zoho_env(monkeypatch, tmp_path):
+    """Credentials in the environment, a cached unexpired token, and a token file under tmp_path"""
+    monkeypatch.setenv("ZOHO_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("ZOHO_CLIENT_ID", "client-id")
+    monkeypatch.setenv("ZOHO_CLIENT_SECRET", "client-secret")
+    monkeypatch.setenv("ZOHO_ORGANIZATION_ID", "org")
+    monkeypatch.setattr(auth, "TOKEN_FILE", tmp_path / "token.json")
+    monkeypatch.setattr(auth, "TOKEN_LOCK_FILE", tmp_path / "token.lock")
+    monkeypatch.setattr(auth, "load_token", lambda use_cache=True: ("token", time.time() + 3600))
+
+@pytest.fixture
+def zoho_client(zoho_env):
+    """ZohoClient that never talks to the accounts server"""
+    client = ZohoClient()
+    yield client
+    client.close()
+
+@pytest.fixture
+def item_client(zoho_env):
+    """ItemClient that never talks to the accounts server"""
+    client = ItemClient()
+    yield client
+    client.close()
+
+@pytest.fixture
+def inventory_client(zoho_env):
+    """ZohoInventoryClient that never talks to the accounts server"""
+    client = ZohoInventoryClient()
+    yield client
+    client.close()
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from mcp_zohoinventory import auth
+
+def test_concurrent_save_token_leaves_one_complete_file(tmp_path, monkeypatch):
+    token_file = tmp_path / "token.json"
+    monkeypatch.setattr(auth, "TOKEN_FILE", token_file)
+    errors = []
+
+    def save(token: str) -> None:
+        try:
+            for _ in range(50):
+                auth.save_token(token)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(f"token-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert json.loads(token_file.read_text())["access_token"].startswith("token-")
+    assert [path.name for path in tmp_path.iterdir()] == ["token.json"]
+
+def _counting_token_endpoint(zoho_auth, delay):
+    """Replace the accounts server with one that hands out a new token after delay seconds"""
+    posts = []
+
+    def post(url, params=None):
+        posts.append(params)
+        time.sleep(delay)
+        return httpx.Response(200, json={"access_token": "new-token", "expires_in": 3600}, request=httpx.Request("POST", url))
+
+    zoho_auth._http.post = post
+    return posts
+
+def test_concurrent_threads_share_one_token_refresh(zoho_env):
+    zoho_auth = auth.ZohoAuth()
+    posts = _counting_token_endpoint(zoho_auth, 0.1)
+    start = threading.Barrier(5)
+    outcomes = []
+
+    def refresh():
+        start.wait()
+        outcomes.append(zoho_auth.refresh_access_token())
+
+    threads = [threading.Thread(target=refresh) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(posts) == 1
+    assert outcomes == [True] * 5
+    assert zoho_auth.auth_token == "new-token"
+    zoho_auth.close()
+
+def test_concurrent_coroutines_share_one_token_refresh(zoho_env):
+    zoho_auth = auth.ZohoAuth()
+    posts = _counting_token_endpoint(zoho_auth, 0.01)
+
+    async def run():
+        return await asyncio.gather(*(zoho_auth.refresh_access_token_async() for _ in range(5)))
+
+    assert asyncio.run(run()) == [True] * 5
+    assert len(posts) == 1
+    zoho_auth.close()
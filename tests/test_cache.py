@@ -0,0 +1,28 @@
+from mcp_zohoinventory import cache
+from mcp_zohoinventory.cache import TTLCache
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    entries = TTLCache(maxsize=4, ttl=30)
+    entries.set("a", 1)
+
+    now[0] += 29.9
+    assert entries.get("a") == 1
+
+    now[0] += 0.1
+    assert entries.get("a", "expired") == "expired"
+    assert len(entries) == 0
+
+def test_least_recently_used_entry_is_evicted():
+    entries = TTLCache(maxsize=2, ttl=30)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert entries.get("a") == 1
+
+    entries.set("c", 3)
+
+    assert entries.get("b") is None
+    assert entries.get("a") == 1
+    assert entries.get("c") == 3
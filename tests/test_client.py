@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+
+from mcp_zohoinventory import client as client_module
+from mcp_zohoinventory.client import ZohoClient
+
+def test_throttled_request_waits_for_retry_after(zoho_client, monkeypatch):
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(429, headers={"Retry-After": "600"}),
+        httpx.Response(201, json={}),
+    ]
+    delays = []
+    zoho_client._http = httpx.Client(base_url=zoho_client.base_url, transport=httpx.MockTransport(lambda request: responses.pop(0)))
+    monkeypatch.setattr(client_module.time, "sleep", delays.append)
+
+    # Throttled requests weren't processed, so even a POST is retried
+    response = zoho_client.make_api_request("POST", "inventoryadjustments", json={})
+
+    assert response.status_code == 201
+    assert delays == [2.0, client_module.MAX_RETRY_AFTER]
+
+def test_async_requests_share_one_concurrency_bound(zoho_client, monkeypatch):
+    monkeypatch.setattr(client_module, "MAX_CONCURRENT_REQUESTS", 2)
+    shared = ZohoClient(share_with=zoho_client)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={})
+
+    async def run():
+        zoho_client._get_async_http()
+        zoho_client._async_http = httpx.AsyncClient(base_url=zoho_client.base_url, transport=httpx.MockTransport(handler))
+        await asyncio.gather(*(
+            client.make_api_request_async("GET", f"items/{i}")
+            for i in range(6)
+            for client in (zoho_client, shared)
+        ))
+        await zoho_client.aclose()
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+def test_not_modified_without_cached_body_is_fetched_again(zoho_client, monkeypatch):
+    sent_headers = []
+
+    def make_api_request(method, endpoint, params=None, headers=None, **kwargs):
+        sent_headers.append(headers)
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        if len(sent_headers) == 1:
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, json={"items": []}, headers={"ETag": '"v1"'}, request=request)
+
+    monkeypatch.setattr(zoho_client, "make_api_request", make_api_request)
+
+    assert zoho_client.get_json_conditional("items") == {"items": []}
+    assert sent_headers == [None, client_module.NO_CACHE_HEADERS]
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+from mcp_zohoinventory import items
+
+def test_list_async_after_not_modified_page_does_not_grow(item_client, monkeypatch):
+    monkeypatch.setattr(items, "LIST_PAGE_SIZE", 2)
+    pages = {
+        1: [{"item_id": "1"}, {"item_id": "2"}],
+        2: [{"item_id": "3"}, {"item_id": "4"}],
+        3: [{"item_id": "5"}, {"item_id": "6"}],
+    }
+
+    async def make_api_request_async(method, endpoint, params=None, headers=None, **kwargs):
+        page = params["page"]
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        # Page 1 is unchanged, so a revalidation of it gets a 304
+        if page == 1 and headers and headers.get("If-None-Match") == '"page-1"':
+            return httpx.Response(304, request=request)
+        body = {
+            "items": [dict(item) for item in pages[page]],
+            "page_context": {"page": page, "has_more_page": page < 3, "total": 6},
+        }
+        return httpx.Response(200, json=body, headers={"ETag": f'"page-{page}"'}, request=request)
+
+    monkeypatch.setattr(item_client, "make_api_request_async", make_api_request_async)
+
+    first = asyncio.run(item_client.list_async())
+    second = asyncio.run(item_client.list_async())
+    third = asyncio.run(item_client.list_async())
+
+    assert [item["item_id"] for item in first] == ["1", "2", "3", "4", "5", "6"]
+    assert len(second) == 6
+    assert len(third) == 6
+
+def test_override_reads_current_stock_past_the_cache(item_client, monkeypatch):
+    stock = {"value": 5}
+    posts = []
+
+    def make_api_request(method, endpoint, **kwargs):
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        if method == "GET":
+            return httpx.Response(200, json={"item": {"item_id": "1", "available_stock": stock["value"]}}, request=request)
+        posts.append(kwargs["json"])
+        return httpx.Response(201, json={"inventoryadjustment": {}}, request=request)
+
+    monkeypatch.setattr(item_client, "make_api_request", make_api_request)
+
+    assert item_client.get_item_stock_by_id("1") == 5
+    # Changed outside this client while the read above is still cached
+    stock["value"] = 7
+    assert item_client.get_item_stock_by_id("1") == 5
+
+    item_client.override_item_stock_by_id("1", 10)
+
+    assert posts[0]["line_items"] == [{"item_id": "1", "quantity_adjusted": 3}]
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from mcp_zohoinventory import server
+
+def test_coalesce_shares_one_call_between_concurrent_callers():
+    calls = []
+
+    @server._coalesce
+    async def handler(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"result-{key}"
+
+    async def run():
+        return await asyncio.gather(handler("a"), handler("a"), handler("b"))
+
+    assert asyncio.run(run()) == ["result-a", "result-a", "result-b"]
+    assert calls == ["a", "b"]
+
+def test_coalesce_cancelled_caller_leaves_the_shared_call_running():
+    calls = []
+    release = None
+
+    @server._coalesce
+    async def handler(key):
+        calls.append(key)
+        await release.wait()
+        return f"result-{key}"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(handler("a"))
+        second = asyncio.create_task(handler("a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        shared = await second
+        # The finished call is forgotten, so a later call runs again
+        again = await handler("a")
+        return shared, again
+
+    assert asyncio.run(run()) == ("result-a", "result-a")
+    assert calls == ["a", "a"]
+
+class FakeInventoryClient:
+    """Resolves two warehouses and records the entries sent to override_stock_bulk"""
+    
+    def __init__(self):
+        self.entries = None
+    
+    def get_location_id_by_warehouse_name(self, warehouse_name):
+        if warehouse_name != "Main":
+            raise ValueError(f"Warehouse not found with name: {warehouse_name}")
+        return "wh-1"
+    
+    async def override_stock_bulk(self, entries, reason):
+        self.entries = entries
+        return [
+            ValueError(f"Item not found with SKU: {entry['sku']}") if entry["sku"] == "SKU-MISSING"
+            else {"inventory_adjustment_id": "adj"}
+            for entry in entries
+        ]
+
+def test_update_stock_bulk_reports_each_entry(monkeypatch):
+    client = FakeInventoryClient()
+    monkeypatch.setattr(server, "_get_client", lambda: client)
+
+    response = json.loads(asyncio.run(server.update_stock_bulk([
+        {"sku": "SKU-A", "quantity": 5, "warehouse_name": "Main"},
+        {"sku": "SKU-B", "quantity": 2, "warehouse_name": "Nowhere"},
+        {"sku": "SKU-MISSING", "quantity": 1},
+    ], "Sync")))
+
+    assert client.entries == [
+        {"sku": "SKU-A", "target_quantity": 5, "location_id": "wh-1"},
+        {"sku": "SKU-MISSING", "target_quantity": 1, "location_id": None},
+    ]
+    assert response["success"] is False
+    assert [entry["success"] for entry in response["results"]] == [True, False, False]
+    assert response["results"][0]["adjustment"] == {"inventory_adjustment_id": "adj"}
+    assert response["results"][1]["error"] == "Warehouse not found with name: Nowhere"
+    assert response["results"][2]["error"] == "Item not found with SKU: SKU-MISSING"
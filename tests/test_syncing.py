@@ -0,0 +1,65 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import syncing
+
+class FakeSession:
+    """Stands in for the MCP ClientSession, answering every tool call with one JSON body"""
+    
+    def __init__(self, body):
+        self.body = body
+    
+    async def call_tool(self, name, arguments):
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(self.body))])
+
+UPDATES = [
+    {"sku": "SKU-A", "quantity": 1, "warehouse_name": "Main"},
+    {"sku": "SKU-B", "quantity": 2, "warehouse_name": "Main"},
+]
+
+def test_bulk_tool_results_missing_an_entry_report_it_failed():
+    session = FakeSession({"success": True, "results": [{"sku": "SKU-A", "success": True}]})
+
+    results = asyncio.run(syncing.call_update_stock_bulk_tool(session, UPDATES))
+
+    assert results[0] == {"sku": "SKU-A", "success": True}
+    assert results[1]["error"] == "No result returned for SKU SKU-B"
+
+def test_bulk_tool_empty_results_report_every_entry_failed():
+    session = FakeSession({"success": True, "results": []})
+
+    results = asyncio.run(syncing.call_update_stock_bulk_tool(session, UPDATES))
+
+    assert [result.get("success", False) for result in results] == [False, False]
+    assert all("error" in result for result in results)
+
+def test_bulk_tool_call_failure_reports_every_entry_failed():
+    session = FakeSession({"error": "Server unavailable"})
+
+    results = asyncio.run(syncing.call_update_stock_bulk_tool(session, UPDATES))
+
+    assert results == [{"error": "Server unavailable"}] * 2
+
+def test_to_int_treats_empty_cells_as_zero_and_rejects_text():
+    assert syncing._to_int(7) == 7
+    assert syncing._to_int("12") == 12
+    assert syncing._to_int("") == 0
+    assert syncing._to_int(None) == 0
+    assert syncing._to_int("n/a") is None
+    assert syncing._to_int([1]) is None
+
+def test_process_inventory_data_sums_by_sku_and_translated_warehouse():
+    rows = [
+        {"SBS SKU": "SKU-A", "CURRENT LOCATION": "STOCK IN WAREHOUSE - ES", "QTY": "5", "ADJ": "-1"},
+        {"SBS SKU": "SKU-A", "CURRENT LOCATION": "STOCK IN WAREHOUSE - ES", "QTY": 2, "ADJ": ""},
+        {"SBS SKU": "SKU-A", "CURRENT LOCATION": "Other", "QTY": "3"},
+        {"SBS SKU": "SKU-B", "CURRENT LOCATION": "Main", "QTY": "oops", "ADJ": "1"},
+        {"SBS SKU": "  ", "CURRENT LOCATION": "Main", "QTY": "9"},
+        {"CURRENT LOCATION": "Main", "QTY": "9"},
+    ]
+
+    stock = syncing.process_inventory_data(iter(rows))
+
+    # Unmapped locations keep their spreadsheet name
+    assert stock == {"SKU-A": {"Spain Warehouse": 6, "Other": 3}}
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import httpx
+
+def test_override_stock_bulk_sends_one_adjustment(inventory_client, monkeypatch):
+    item_ids = {"SKU-A": "1", "SKU-B": "2"}
+    stock = {("1", "wh-1"): 5, ("1", "wh-2"): 3, ("2", None): 7}
+    requests = []
+
+    async def get_item_by_sku_async(sku):
+        return {"item_id": item_ids[sku], "sku": sku} if sku in item_ids else {}
+
+    async def make_api_request_async(method, endpoint, **kwargs):
+        requests.append((method, endpoint, kwargs.get("json")))
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        if method == "GET":
+            item_id = endpoint.split("/")[1]
+            item = {
+                "item_id": item_id,
+                "available_stock": stock[(item_id, None)] if (item_id, None) in stock else 0,
+                "warehouses": [
+                    {"warehouse_id": location_id, "warehouse_available_stock": quantity}
+                    for (stock_item_id, location_id), quantity in stock.items()
+                    if stock_item_id == item_id and location_id
+                ],
+            }
+            return httpx.Response(200, json={"item": item}, request=request)
+        return httpx.Response(201, json={"inventoryadjustment": {"inventory_adjustment_id": "adj"}}, request=request)
+
+    monkeypatch.setattr(inventory_client, "get_item_by_sku_async", get_item_by_sku_async)
+    monkeypatch.setattr(inventory_client._item_client, "make_api_request_async", make_api_request_async)
+
+    results = asyncio.run(inventory_client.override_stock_bulk([
+        {"sku": "SKU-A", "target_quantity": 8, "location_id": "wh-1"},
+        {"sku": "SKU-A", "target_quantity": 3, "location_id": "wh-2"},
+        {"sku": "SKU-B", "target_quantity": 4},
+        {"sku": "SKU-MISSING", "target_quantity": 1},
+    ], "Sync"))
+
+    posts = [payload for method, _, payload in requests if method == "POST"]
+    assert len(posts) == 1
+    assert posts[0]["reason"] == "Sync"
+    assert posts[0]["line_items"] == [
+        {"item_id": "1", "quantity_adjusted": 3, "warehouse_id": "wh-1"},
+        {"item_id": "2", "quantity_adjusted": -3},
+    ]
+    assert results[0] == {"inventory_adjustment_id": "adj"}
+    assert results[1]["current_quantity"] == 3
+    assert results[2] == {"inventory_adjustment_id": "adj"}
+    assert isinstance(results[3], ValueError)
+
+def test_override_stock_bulk_retries_rejected_adjustment_per_item(inventory_client, monkeypatch):
+    item_ids = {"SKU-A": "1", "SKU-B": "2", "SKU-C": "3"}
+    line_item_batches = []
+    invalidated = []
+
+    async def get_item_by_sku_async(sku):
+        return {"item_id": item_ids[sku], "sku": sku}
+
+    async def make_api_request_async(method, endpoint, **kwargs):
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        if method == "GET":
+            return httpx.Response(200, json={"item": {"item_id": endpoint.split("/")[1], "available_stock": 5}}, request=request)
+        line_items = kwargs["json"]["line_items"]
+        line_item_batches.append([line_item["item_id"] for line_item in line_items])
+        # Zoho rejects the whole adjustment when one of its line items is invalid
+        if any(line_item["item_id"] == "2" for line_item in line_items):
+            response = httpx.Response(400, json={"code": 2, "message": "Invalid item"}, request=request)
+            raise httpx.HTTPStatusError("Bad Request", request=request, response=response)
+        return httpx.Response(201, json={"inventoryadjustment": {"inventory_adjustment_id": f"adj-{len(line_item_batches)}"}}, request=request)
+
+    monkeypatch.setattr(inventory_client, "get_item_by_sku_async", get_item_by_sku_async)
+    monkeypatch.setattr(inventory_client._item_client, "make_api_request_async", make_api_request_async)
+    monkeypatch.setattr(inventory_client, "invalidate_sku", invalidated.append)
+
+    results = asyncio.run(inventory_client.override_stock_bulk([
+        {"sku": "SKU-A", "target_quantity": 8},
+        {"sku": "SKU-B", "target_quantity": 9},
+        {"sku": "SKU-C", "target_quantity": 5},
+        {"sku": "SKU-A", "target_quantity": 2, "location_id": "wh-1"},
+    ], "Sync"))
+
+    assert line_item_batches[0] == ["1", "2", "1"]
+    assert sorted(line_item_batches[1:]) == [["1"], ["1"], ["2"]]
+    assert results[0]["inventory_adjustment_id"].startswith("adj-")
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[2]["current_quantity"] == 5
+    assert results[3]["inventory_adjustment_id"].startswith("adj-")
+    assert invalidated == ["SKU-B"]
+
+def test_override_stock_by_sku_async_looks_up_item_and_warehouse_together(inventory_client, monkeypatch):
+    warehouse_lookup_started = threading.Event()
+    posts = []
+
+    def get_location_id_by_warehouse_name(warehouse_name):
+        warehouse_lookup_started.set()
+        return "wh-1"
+
+    async def get_item_by_sku_async(sku):
+        # Only returns once the warehouse lookup is running alongside it
+        for _ in range(1000):
+            if warehouse_lookup_started.is_set():
+                return {"item_id": "1", "sku": sku}
+            await asyncio.sleep(0.001)
+        raise AssertionError("The warehouse lookup did not start during the item lookup")
+
+    async def make_api_request_async(method, endpoint, **kwargs):
+        request = httpx.Request(method, f"https://example.test/{endpoint}")
+        if method == "GET":
+            item = {"item_id": "1", "warehouses": [{"warehouse_id": "wh-1", "warehouse_available_stock": 2}]}
+            return httpx.Response(200, json={"item": item}, request=request)
+        posts.append(kwargs["json"])
+        return httpx.Response(201, json={"inventoryadjustment": {"inventory_adjustment_id": "adj"}}, request=request)
+
+    monkeypatch.setattr(inventory_client, "get_location_id_by_warehouse_name", get_location_id_by_warehouse_name)
+    monkeypatch.setattr(inventory_client, "get_item_by_sku_async", get_item_by_sku_async)
+    monkeypatch.setattr(inventory_client._item_client, "make_api_request_async", make_api_request_async)
+
+    adjustment = asyncio.run(inventory_client.override_stock_by_sku_async("SKU-A", 5, "Sync", "Main"))
+
+    assert adjustment == {"inventory_adjustment_id": "adj"}
+    assert posts[0]["line_items"] == [{"item_id": "1", "quantity_adjusted": 3, "warehouse_id": "wh-1"}]